@@ -14,7 +14,7 @@ from app.services.memory_service import (
     compress_memories,
     delete_memory,
     list_all_memories,
-    search_memories,
+    search_memories_async,
     set_memory_enabled,
 )
 
@@ -107,7 +107,7 @@ def remove_memory(memory_id: str):
 
 
 @router.get('/search')
-def search(
+async def search(
     q: str,
     limit: int = None,
     session_id: str = Query(...),
@@ -123,7 +123,7 @@ def search(
         if not session_id:
             raise HTTPException(status_code=HTTP_BAD_REQUEST, detail='session_id is required')
         logger.info('Searching memories for session %s (limit=%s)', session_id, limit)
-        return search_memories(session_id, q, limit)
+        return await search_memories_async(session_id, q, limit)
     except Exception as e:
         logger.error('Failed to search memories: %s', e, exc_info=True)
         raise HTTPException(status_code=HTTP_INTERNAL_ERROR, detail='Failed to search memories')
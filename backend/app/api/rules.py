@@ -11,6 +11,8 @@ from app.config.constants import HTTP_INTERNAL_ERROR
 from app.config.settings import settings
 from app.core.db import rules_collection, sessions_collection
 from app.models.dto import RulesConfig
+from app.services.memory_service import invalidate_session_memory_limit
+from app.services.web_search_service import invalidate_rules_cache
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ async def update_rules(rules: RulesConfig):
     try:
         rules_dict = rules.model_dump()
         rules_collection.update_one({}, {'$set': rules_dict}, upsert=True)
+        invalidate_rules_cache()
         logger.info(f'Rules updated: {rules_dict}')
         return rules
 
@@ -104,6 +107,11 @@ async def update_session_rules(session_id: str, rules: RulesConfig):
         if result.modified_count == 0:
             logger.warning(f'No changes made to session {session_id}')
 
+        # Memory search and web search cache per-session rules - drop the
+        # stale entries
+        invalidate_session_memory_limit(session_id)
+        invalidate_rules_cache(session_id)
+
         logger.info(f'Session rules updated for {session_id}: {rules_dict}')
 
         # Verify the update by reading back
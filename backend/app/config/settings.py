@@ -154,6 +154,40 @@ class Settings(BaseSettings):
     LOCAL_EXTRACT_MAX_BYTES: int = 1_000_000
     LOCAL_EXTRACT_TIMEOUT: float = 10.0
 
+    # ============================================================
+    # EMBEDDING SETTINGS
+    # ============================================================
+    EMBEDDING_MODEL: str = 'all-MiniLM-L6-v2'
+
+    # 'torch' (default) or 'onnx' - the ONNX backend with a quantized model
+    # file is ~3x faster on CPU with negligible retrieval quality loss
+    EMBEDDING_BACKEND: str = 'torch'
+
+    # Quantized model file to load when EMBEDDING_BACKEND='onnx'
+    EMBEDDING_ONNX_FILE: str = 'onnx/model_qint8_avx512_vnni.onnx'
+
+    # Micro-batching window for concurrent single-text embed requests
+    EMBEDDING_BATCH_WINDOW_MS: int = 20
+    EMBEDDING_BATCH_MAX: int = 32
+
+    # SQLite file for the persistent embedding cache (empty = disabled)
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+
+    # Store memory embeddings as int8 (4x smaller documents and DB
+    # transfer). Leave off if using Atlas $vectorSearch, which needs the
+    # float 'embedding' field. Search reads both formats either way.
+    MEMORY_EMBEDDING_INT8: bool = False
+
+    # Sessions with at least this many memories use the hnswlib ANN
+    # index (when installed); smaller ones stay on the brute-force scan
+    MEMORY_ANN_MIN_CANDIDATES: int = 256
+
+    # Name of an Atlas Vector Search index on the 'embedding' field. When
+    # set, memory search is pushed into MongoDB via $vectorSearch instead
+    # of scoring candidates client-side. Requires Atlas; leave unset for
+    # a plain MongoDB deployment.
+    MEMORY_VECTOR_SEARCH_INDEX: Optional[str] = None
+
     # ============================================================
     # MEMORY AUTO-SAVE SETTINGS
     # ============================================================
@@ -198,6 +232,9 @@ class Settings(BaseSettings):
     FILE_ATTACHMENT_MAX_CHARS: int = 100000
     FILE_ATTACHMENT_EXPIRY_DAYS: int = 30
 
+    # How long extracted file text stays cached by content digest
+    EXTRACTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
     # ============================================================
     # FACTUAL GUARD THRESHOLDS
     # ============================================================
@@ -1,5 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
+
+import httpx
+
+# One pooled client for all providers: per-call AsyncClient instances
+# paid a TCP + TLS handshake on every search/extract. Timeouts stay
+# per-request since each provider configures its own.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Shared AsyncClient for provider HTTP calls (keep-alive pooling).
+
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+
+async def close_shared_client() -> None:
+    """
+    Close the shared client; called from app shutdown.
+
+    """
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
 
 
 class WebSearchProvider(ABC):
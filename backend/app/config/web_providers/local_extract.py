@@ -9,6 +9,7 @@ from bs4 import BeautifulSoup
 from readability import Document
 
 from app.config.settings import settings
+from app.config.web_providers.base import get_shared_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,34 +37,34 @@ async def _fetch_html(url: str) -> Optional[str]:
 
     timeout = httpx.Timeout(REQUEST_TIMEOUT)
 
-    async with httpx.AsyncClient(
-        follow_redirects=True,
-        headers=headers,
-        timeout=timeout,
-    ) as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-
-            if resp.content and len(resp.content) > MAX_BYTES:
-                logger.warning(
-                    'Local extract skipped (response too large): %s bytes', len(resp.content)
-                )
-                return None
-
-            ctype = resp.headers.get('content-type', '').lower()
-            if not any(t in ctype for t in ALLOWED_CONTENT_TYPES):
-                return None
-
-            if not resp.text.strip():
-                logger.debug('Local extract: empty body returned')
-                return None
-
-            return resp.text
-        except Exception as e:
-            logger.warning('Local extract fetch error: %s', e)
+    try:
+        resp = await get_shared_client().get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        resp.raise_for_status()
+
+        if resp.content and len(resp.content) > MAX_BYTES:
+            logger.warning(
+                'Local extract skipped (response too large): %s bytes', len(resp.content)
+            )
+            return None
+
+        ctype = resp.headers.get('content-type', '').lower()
+        if not any(t in ctype for t in ALLOWED_CONTENT_TYPES):
             return None
 
+        if not resp.text.strip():
+            logger.debug('Local extract: empty body returned')
+            return None
+
+        return resp.text
+    except Exception as e:
+        logger.warning('Local extract fetch error: %s', e)
+        return None
+
 
 def _extract_main_text(html: str) -> str:
     doc = Document(html)
@@ -4,7 +4,7 @@ from typing import Any
 import httpx
 
 from app.config.settings import settings
-from app.config.web_providers.base import WebSearchProvider
+from app.config.web_providers.base import WebSearchProvider, get_shared_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,18 +26,18 @@ class SearXNGProvider(WebSearchProvider):
         timeout = httpx.Timeout(settings.SEARXNG_TIMEOUT)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                res = await client.get(
-                    f'{settings.SEARXNG_URL}/search',
-                    headers=headers,
-                    params={
-                        'q': query,
-                        'format': 'json',
-                        'language': 'en',
-                    },
-                )
-                res.raise_for_status()
-                payload = res.json()
+            res = await get_shared_client().get(
+                f'{settings.SEARXNG_URL}/search',
+                headers=headers,
+                params={
+                    'q': query,
+                    'format': 'json',
+                    'language': 'en',
+                },
+                timeout=timeout,
+            )
+            res.raise_for_status()
+            payload = res.json()
 
         except Exception as e:
             logger.warning(f'SearXNG search failed: {e}')
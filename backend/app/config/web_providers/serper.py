@@ -1,27 +1,50 @@
 import logging
+import time
 from typing import Any
 
 import httpx
 
 from app.config.settings import settings
-from app.config.web_providers.base import WebSearchProvider
+from app.config.web_providers.base import WebSearchProvider, get_shared_client
 from app.core.db import serper_quota_collection
 
 logger = logging.getLogger(__name__)
 
 quota = serper_quota_collection
 
+# Remaining quota is checked on every search (and logged besides); a
+# short-lived cache keeps that find_one off the hot path. Consumption
+# decrements the cached value so the local view stays exact between
+# refreshes; other workers' usage is picked up at the next refresh.
+_QUOTA_CACHE_TTL_S = 30
+_quota_cache: dict = {'remaining': None, 'stamp': 0.0}
+
 
 def remaining_serper_quota() -> int:
-    doc = quota.find_one({'_id': 'serper'})
     if settings.SERPER_TOTAL_LIMIT is None:
         return 0
-    if not doc:
-        return settings.SERPER_TOTAL_LIMIT
-    return max(0, settings.SERPER_TOTAL_LIMIT - doc['count'])
+
+    now = time.monotonic()
+    if (
+        _quota_cache['remaining'] is not None
+        and now - _quota_cache['stamp'] < _QUOTA_CACHE_TTL_S
+    ):
+        return _quota_cache['remaining']
+
+    doc = quota.find_one({'_id': 'serper'})
+    remaining = (
+        settings.SERPER_TOTAL_LIMIT
+        if not doc
+        else max(0, settings.SERPER_TOTAL_LIMIT - doc['count'])
+    )
+    _quota_cache['remaining'] = remaining
+    _quota_cache['stamp'] = now
+    return remaining
 
 
 def consume_serper():
+    if _quota_cache['remaining'] is not None:
+        _quota_cache['remaining'] = max(0, _quota_cache['remaining'] - 1)
     quota.update_one(
         {'_id': 'serper'},
         {'$inc': {'count': 1}},
@@ -51,16 +74,16 @@ class SerperProvider(WebSearchProvider):
         timeout = httpx.Timeout(settings.SERPER_TIMEOUT)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                res = await client.post(
-                    f'{settings.SERPER_URL}/search',
-                    headers={
-                        'X-API-KEY': settings.SERPER_API_KEY,
-                        'Content-Type': 'application/json',
-                    },
-                    json={'q': query, 'num': limit},
-                )
-                res.raise_for_status()
+            res = await get_shared_client().post(
+                f'{settings.SERPER_URL}/search',
+                headers={
+                    'X-API-KEY': settings.SERPER_API_KEY,
+                    'Content-Type': 'application/json',
+                },
+                json={'q': query, 'num': limit},
+                timeout=timeout,
+            )
+            res.raise_for_status()
         except (httpx.HTTPError, httpx.TimeoutException) as e:
             logger.warning('Serper request failed: %s', e)
             return []
@@ -1,33 +1,66 @@
 import logging
+import time
 from datetime import date
 from typing import Any
 
 import httpx
 
 from app.config.settings import settings
-from app.config.web_providers.base import WebSearchProvider
+from app.config.web_providers.base import WebSearchProvider, get_shared_client
 from app.core.db import tavily_quota_collection
 
 logger = logging.getLogger(__name__)
 
 quota = tavily_quota_collection
 
+# Month key and remaining quota are recomputed/refetched per search; a
+# short-lived cache drops the date formatting and the find_one from the
+# hot path. Consumption decrements the cached value so the local view
+# stays exact between refreshes; other workers' usage shows up at the
+# next refresh, and a month rollover invalidates the quota entry.
+_MONTH_KEY_TTL_S = 60
+_QUOTA_CACHE_TTL_S = 30
+_month_cache: dict = {'key': '', 'stamp': 0.0}
+_quota_cache: dict = {'remaining': None, 'stamp': 0.0, 'month': ''}
+
 
 def month_key():
-    today = date.today()
-    return f'{today.year}-{today.month:02d}'
+    now = time.monotonic()
+    if not _month_cache['key'] or now - _month_cache['stamp'] > _MONTH_KEY_TTL_S:
+        today = date.today()
+        _month_cache['key'] = f'{today.year}-{today.month:02d}'
+        _month_cache['stamp'] = now
+    return _month_cache['key']
 
 
 def remaining_tavily_quota() -> int:
-    doc = quota.find_one({'month': month_key()})
     if settings.TAVILY_MONTHLY_LIMIT is None:
         return 0
-    if not doc:
-        return settings.TAVILY_MONTHLY_LIMIT
-    return max(0, settings.TAVILY_MONTHLY_LIMIT - doc['count'])
+
+    month = month_key()
+    now = time.monotonic()
+    if (
+        _quota_cache['remaining'] is not None
+        and _quota_cache['month'] == month
+        and now - _quota_cache['stamp'] < _QUOTA_CACHE_TTL_S
+    ):
+        return _quota_cache['remaining']
+
+    doc = quota.find_one({'month': month})
+    remaining = (
+        settings.TAVILY_MONTHLY_LIMIT
+        if not doc
+        else max(0, settings.TAVILY_MONTHLY_LIMIT - doc['count'])
+    )
+    _quota_cache['remaining'] = remaining
+    _quota_cache['stamp'] = now
+    _quota_cache['month'] = month
+    return remaining
 
 
 def consume_tavily():
+    if _quota_cache['remaining'] is not None:
+        _quota_cache['remaining'] = max(0, _quota_cache['remaining'] - 1)
     quota.update_one(
         {'month': month_key()},
         {'$inc': {'count': 1}},
@@ -57,19 +90,19 @@ class TavilyProvider(WebSearchProvider):
         timeout = httpx.Timeout(settings.TAVILY_TIMEOUT)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                res = await client.post(
-                    f'{settings.TAVILY_URL}/search',
-                    json={
-                        'api_key': settings.TAVILY_API_KEY,
-                        'query': query,
-                        'max_results': limit,
-                        'search_depth': 'advanced',
-                        'include_answer': False,
-                        'include_images': False,
-                    },
-                )
-                res.raise_for_status()
+            res = await get_shared_client().post(
+                f'{settings.TAVILY_URL}/search',
+                json={
+                    'api_key': settings.TAVILY_API_KEY,
+                    'query': query,
+                    'max_results': limit,
+                    'search_depth': 'advanced',
+                    'include_answer': False,
+                    'include_images': False,
+                },
+                timeout=timeout,
+            )
+            res.raise_for_status()
         except (httpx.HTTPError, httpx.TimeoutException) as e:
             logger.warning('Tavily request failed: %s', e)
             return []
@@ -4,6 +4,7 @@ from datetime import date
 import httpx
 
 from app.config.settings import settings
+from app.config.web_providers.base import get_shared_client
 from app.core.db import tavily_quota_collection
 
 logger = logging.getLogger(__name__)
@@ -37,16 +38,16 @@ async def extract_url(url: str) -> str:
     timeout = httpx.Timeout(settings.TAVILY_EXTRACT_TIMEOUT)
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            res = await client.post(
-                f'{settings.TAVILY_URL}/extract',
-                json={
-                    'api_key': settings.TAVILY_API_KEY,
-                    'urls': [url],
-                    'include_images': False,
-                },
-            )
-            res.raise_for_status()
+        res = await get_shared_client().post(
+            f'{settings.TAVILY_URL}/extract',
+            json={
+                'api_key': settings.TAVILY_API_KEY,
+                'urls': [url],
+                'include_images': False,
+            },
+            timeout=timeout,
+        )
+        res.raise_for_status()
     except Exception as e:
         logger.warning('Tavily extract request failed: %s', e)
         return ''
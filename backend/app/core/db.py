@@ -47,19 +47,40 @@ tavily_quota_collection = db['tavily_quota']
 synthesized_memory_collection = db['synthesized_memory']
 file_attachments_collection = db['file_attachments']
 
+# Extracted file text keyed by content digest (skips re-parsing repeats)
+extraction_cache_collection = db['extraction_cache']
+
 """
 Index Creation
 
 """
 try:
+    # Sessions are addressed by UUID 'id' on every chat/rules/search
+    # request; without this the lookup is a collection scan
+    sessions_collection.create_index('id', unique=True)
+
     # Synthesized memory indexes for fast queries
     synthesized_memory_collection.create_index([('session_id', 1), ('last_referenced_at', -1)])
     synthesized_memory_collection.create_index([('session_id', 1), ('category', 1)])
     synthesized_memory_collection.create_index([('session_id', 1), ('is_deprecated', 1)])
+    # Matches the search_memories candidate query predicate
+    synthesized_memory_collection.create_index(
+        [('session_id', 1), ('is_deprecated', 1), ('enabled', 1)]
+    )
+    # Memories are addressed by UUID 'id', not '_id'
+    synthesized_memory_collection.create_index('id', unique=True)
 
     # File attachments indexes for expiration and retrieval
     file_attachments_collection.create_index([('session_id', 1), ('expires_at', 1)])
     file_attachments_collection.create_index([('session_id', 1), ('uploaded_at', -1)])
+    # Attachments are addressed by UUID 'id', not '_id'
+    file_attachments_collection.create_index('id', unique=True)
+
+    # Extraction cache: lookup by digest, entries expire via TTL
+    extraction_cache_collection.create_index('digest', unique=True)
+    extraction_cache_collection.create_index(
+        'created_at', expireAfterSeconds=settings.EXTRACTION_CACHE_TTL_SECONDS
+    )
 
     logger.info('Database indexes created successfully')
 except Exception as e:
@@ -14,7 +14,9 @@ from app.api.memory import router as memory_router
 from app.api.rules import router as rule_router
 from app.api.web import router as web_router
 from app.config.settings import settings
+from app.config.web_providers.base import close_shared_client
 from app.core.db import client
+from app.services.ollama_service import close_ollama_client
 
 # Configure logging level from environment
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
@@ -42,6 +44,13 @@ app.add_middleware(
 )
 
 
+@app.on_event('shutdown')
+async def shutdown_http_clients():
+    """Close the shared Ollama and web-provider HTTP clients"""
+    await close_ollama_client()
+    await close_shared_client()
+
+
 @app.get('/')
 async def read_root():
     """Root endpoint - welcome message"""
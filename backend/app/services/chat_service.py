@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re
@@ -43,7 +44,7 @@ from app.services.memory_service import (
     add_synthesized_memory,
     auto_memory_if_needed,
     list_memories_by_category,
-    search_memories,
+    search_memories_async,
 )
 from app.services.ollama_service import stream_ollama
 from app.services.reasoning_veto_service import assess_reasoning_veto
@@ -707,7 +708,7 @@ async def _build_memory_context(session_id: str, query: str, limits: dict) -> di
     """Build context from semantic memories."""
     try:
         important_memories = list_memories_by_category(session_id, 'important')
-        memories = search_memories(
+        memories = await search_memories_async(
             chat_sessionId=session_id,
             query=query,
             limit=limits.get('memory_items', MEMORY_RESULTS_LIMIT),
@@ -1058,6 +1059,27 @@ def rewrite_for_verification(
     return answer
 
 
+# Strong references to fire-and-forget tasks: the event loop only holds
+# weak refs, so an untracked task can be garbage-collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _run_auto_memory(
+    session_id: str, user_text: str, assistant_text: str, model: str
+) -> None:
+    # Background wrapper: auto-memory errors are logged, never surfaced
+    try:
+        await auto_memory_if_needed(
+            chat_sessionId=session_id,
+            user_text=user_text,
+            assistant_text=assistant_text,
+            model=model,
+        )
+        logger.info('Auto-memory processed', extra={'session_id': session_id})
+    except Exception as e:
+        logger.warning(f'Auto-memory failed: {e}')
+
+
 async def stream_chat_reply(
     session_id: str,
     content: str,
@@ -1093,10 +1115,11 @@ async def stream_chat_reply(
     # ─────────────────────────────────────────────────────────────────────
     # Step 1: Save user message
     # ─────────────────────────────────────────────────────────────────────
+    now = datetime.utcnow()
     user_msg = {
         'role': 'user',
         'content': content,
-        'created_at': datetime.utcnow(),
+        'created_at': now,
     }
 
     # Include attachment reference if file was uploaded for this session
@@ -1117,7 +1140,7 @@ async def stream_chat_reply(
         {'id': session_id},
         {
             '$push': {'messages': user_msg},
-            '$set': {'updated_at': datetime.utcnow()},
+            '$set': {'updated_at': now},
         },
     )
     logger.info('User message saved', extra={'session_id': session_id})
@@ -1348,10 +1371,11 @@ async def stream_chat_reply(
     # ─────────────────────────────────────────────────────────────────────
     # Step 8: Save assistant message with FULL verification details
     # ─────────────────────────────────────────────────────────────────────
+    saved_at = datetime.utcnow()
     assistant_msg = {
         'role': 'assistant',
         'content': assistant_answer.strip(),
-        'created_at': datetime.utcnow(),
+        'created_at': saved_at,
         'meta': {
             'source_used': 'combined',
             'sources_considered': sources,
@@ -1383,7 +1407,7 @@ async def stream_chat_reply(
             {'id': session_id},
             {
                 '$push': {'messages': assistant_msg},
-                '$set': {'updated_at': datetime.utcnow()},
+                '$set': {'updated_at': saved_at},
             },
         )
         logger.info(
@@ -1398,18 +1422,19 @@ async def stream_chat_reply(
         return
 
     # ─────────────────────────────────────────────────────────────────────
-    # Step 9: Auto-memory
+    # Step 9: Auto-memory (fire-and-forget - summarization and the write
+    # are best-effort and shouldn't delay stream completion)
     # ─────────────────────────────────────────────────────────────────────
-    try:
-        await auto_memory_if_needed(
-            chat_sessionId=session_id,
+    task = asyncio.create_task(
+        _run_auto_memory(
+            session_id=session_id,
             user_text=content,
             assistant_text=assistant_answer,
             model=model,
         )
-        logger.info('Auto-memory processed', extra={'session_id': session_id})
-    except Exception as e:
-        logger.warning(f'Auto-memory failed: {e}')
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     # ─────────────────────────────────────────────────────────────────────
     # Step 10: Send completion with verification details
@@ -11,8 +11,10 @@ Handles context assembly from multiple sources:
 import logging
 import re
 
+import numpy as np
+
 from app.config.settings import settings
-from app.utils.text_utils import calculate_sentence_score, split_into_sentences
+from app.utils.text_utils import calculate_sentence_scores, split_into_sentences
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,21 @@ CONFIDENCE_HISTORY = settings.CONFIDENCE_HISTORY
 CONFIDENCE_WEB = settings.CONFIDENCE_WEB
 CONFIDENCE_NONE = settings.CONFIDENCE_NONE
 
+# Pattern: [Attached file: filename.ext]\nfile_content
+# Compiled once at import - extract_file_content runs on every message
+_FILE_ATTACH_RE = re.compile(r'\n\n\[Attached file: ([^\]]+)\]\n(.+)', re.DOTALL)
+
+# Common words that don't add relevance when ranking search results
+_STOP_WORDS = frozenset(
+    ('the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by')
+)
+
+# Contextual-only sources excluded from confidence calculation
+_CONTEXTUAL_SOURCES = frozenset(('history', 'follow-up'))
+
+# Sources that must have actual loaded content to count toward confidence
+_CONTENT_CHECKED_SOURCES = frozenset(('file', 'memory', 'web'))
+
 
 def extract_key_points(text: str, max_points: int = None) -> list[str]:
     """
@@ -50,7 +67,7 @@ def extract_key_points(text: str, max_points: int = None) -> list[str]:
     if max_points is None:
         max_points = settings.EXTRACT_KEY_POINTS_MAX
 
-    if not text or len(text) < TEXT_MIN_LENGTH:
+    if max_points <= 0 or not text or len(text) < TEXT_MIN_LENGTH:
         return []
 
     # Split into sentences
@@ -60,15 +77,21 @@ def extract_key_points(text: str, max_points: int = None) -> list[str]:
         return []
 
     # Score sentences using utility function
-    scored = []
     total_sentences = min(len(sentences), settings.KEY_POINT_EXTRACTION_SAMPLE_SIZE)
+    sample = sentences[:total_sentences]
 
-    for idx, sent in enumerate(sentences[:total_sentences]):
-        score = calculate_sentence_score(idx, len(sent), total_sentences)
-        scored.append((score, sent))
+    # One vectorized pass over all sentence lengths instead of a Python
+    # call per sentence
+    lengths = np.fromiter((len(sent) for sent in sample), dtype=np.float32, count=total_sentences)
+    scores = calculate_sentence_scores(lengths)
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    key_points = [s[1] for s in scored[:max_points]]
+    # Partial top-k selection: O(N) partition instead of a full sort
+    if max_points < total_sentences:
+        top = np.argpartition(-scores, max_points - 1)[:max_points]
+    else:
+        top = np.arange(total_sentences)
+
+    key_points = [sample[i] for i in top[np.argsort(-scores[top])]]
 
     logger.debug(f'Extracted {len(key_points)} key points from content')
     return key_points
@@ -82,9 +105,7 @@ def extract_file_content(user_content: str) -> tuple[str, dict | None]:
     if not user_content:
         return user_content, None
 
-    # Pattern: [Attached file: filename.ext]\nfile_content
-    pattern = r'\n\n\[Attached file: ([^\]]+)\]\n(.+)'
-    match = re.search(pattern, user_content, re.DOTALL)
+    match = _FILE_ATTACH_RE.search(user_content)
 
     if not match:
         return user_content, None
@@ -126,25 +147,7 @@ def rank_search_results(results: list[dict], query: str) -> list[dict]:
     if not ENABLE_RANKING or not results:
         return results
 
-    query_terms = set(query.lower().split())
-    # Remove common words that don't add relevance
-    stop_words = {
-        'the',
-        'a',
-        'an',
-        'and',
-        'or',
-        'but',
-        'in',
-        'on',
-        'at',
-        'to',
-        'for',
-        'of',
-        'with',
-        'by',
-    }
-    query_terms = query_terms - stop_words
+    query_terms = frozenset(query.lower().split()) - _STOP_WORDS
 
     if not query_terms:
         return results
@@ -152,19 +155,12 @@ def rank_search_results(results: list[dict], query: str) -> list[dict]:
     scored = []
     for r in results:
         # Score based on title + snippet content
-        title = r.get('title', '').lower()
-        snippet = r.get('snippet', '').lower()
-        content = snippet
-
-        text = f'{title} {title} {content}'  # Weight title 2x
-
-        # Count term matches
-        score = sum(1 for term in query_terms if term in text)
+        # Tokenize once per result and use hashed set intersections instead
+        # of one substring scan per query term (title weighted 3x)
+        title_tokens = set(r.get('title', '').lower().split())
+        snippet_tokens = set(r.get('snippet', '').lower().split())
 
-        # Boost score if terms appear in title
-        title_boost = sum(2 for term in query_terms if term in title)
-
-        total_score = score + title_boost
+        total_score = len(query_terms & snippet_tokens) + 3 * len(query_terms & title_tokens)
         scored.append((total_score, r))
 
     # Sort by score descending, keep original order for ties
@@ -193,7 +189,7 @@ def calculate_weighted_confidence(
     # Filter out contextual-only sources
     if factual_sources_only:
         factual_sources = {
-            k: v for k, v in sources_considered.items() if k not in {'history', 'follow-up'}
+            k: v for k, v in sources_considered.items() if k not in _CONTEXTUAL_SOURCES
         }
 
         if not factual_sources:
@@ -207,24 +203,18 @@ def calculate_weighted_confidence(
         )
 
     # Check frozen sources to ensure they actually have content
+    # file/memory/web must report loaded content; other sources
+    # (url-extract, etc.) pass through unchecked
     if loaded_sources:
-        valid_factual_sources = {}
-        for source_name, confidence in sources_considered.items():
-            source_data = loaded_sources.get(source_name, {})
-
-            # Verify source has actual content
-            if source_name == 'file':
-                if source_data.get('available') and source_data.get('count', 0) > 0:
-                    valid_factual_sources[source_name] = confidence
-            elif source_name == 'memory':
-                if source_data.get('available') and source_data.get('count', 0) > 0:
-                    valid_factual_sources[source_name] = confidence
-            elif source_name == 'web':
-                if source_data.get('available') and source_data.get('count', 0) > 0:
-                    valid_factual_sources[source_name] = confidence
-            else:
-                # Other sources (url-extract, etc.)
-                valid_factual_sources[source_name] = confidence
+        valid_factual_sources = {
+            source_name: confidence
+            for source_name, confidence in sources_considered.items()
+            if source_name not in _CONTENT_CHECKED_SOURCES
+            or (
+                loaded_sources.get(source_name, {}).get('available')
+                and loaded_sources.get(source_name, {}).get('count', 0) > 0
+            )
+        }
 
         if not valid_factual_sources:
             logger.warning('No valid factual sources with content')
@@ -232,14 +222,11 @@ def calculate_weighted_confidence(
 
         sources_considered = valid_factual_sources
 
-    # Weight by relevance × confidence
-    weighted_scores = []
-    for source_name, confidence in sources_considered.items():
-        relevance = source_relevance.get(source_name, 0.5)
-        weighted_score = confidence * relevance
-        weighted_scores.append(weighted_score)
-
-    # Use average of weighted scores
-    avg_confidence = sum(weighted_scores) / len(weighted_scores) if weighted_scores else 0.0
+    # Weight by relevance × confidence, averaged (single pass, no list)
+    total = sum(
+        confidence * source_relevance.get(source_name, 0.5)
+        for source_name, confidence in sources_considered.items()
+    )
+    avg_confidence = total / len(sources_considered) if sources_considered else 0.0
 
     return min(max(avg_confidence, 0.0), 1.0)  # Clamp to [0, 1]
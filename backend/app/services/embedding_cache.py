@@ -0,0 +1,83 @@
+"""
+Embedding Cache
+SQLite-backed persistent cache for text embeddings
+
+The in-process LRU only helps within one process lifetime; this cache
+survives restarts so already-seen content never re-runs the model.
+Opt-in via EMBEDDING_CACHE_PATH (disabled when unset).
+
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Sequence
+
+import numpy as np
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# sqlite connections aren't thread-safe by default; embed runs in worker
+# threads, so guard a single shared connection with a lock
+_lock = threading.Lock()
+_conn: sqlite3.Connection | None = None
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(settings.EMBEDDING_CACHE_PATH, check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute(
+            'CREATE TABLE IF NOT EXISTS emb (key BLOB PRIMARY KEY, vec BLOB) WITHOUT ROWID'
+        )
+        _conn.commit()
+    return _conn
+
+
+def _cache_key(text: str) -> bytes:
+    # Keyed by model as well, so a model change never serves stale vectors
+    return hashlib.sha256(f'{settings.EMBEDDING_MODEL}|{text}'.encode()).digest()
+
+
+def get_cached_embedding(text: str) -> list[float] | None:
+    """
+    Look up a stored embedding; None on miss (or when disabled)
+
+    """
+    if not settings.EMBEDDING_CACHE_PATH:
+        return None
+
+    try:
+        with _lock:
+            row = _get_conn().execute(
+                'SELECT vec FROM emb WHERE key = ?', (_cache_key(text),)
+            ).fetchone()
+    except Exception as e:
+        logger.warning(f'Embedding cache read failed: {e}')
+        return None
+
+    if row is None:
+        return None
+    return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+
+def store_embedding(text: str, vec: Sequence[float]) -> None:
+    """
+    Persist an embedding; failures are logged, never raised
+
+    """
+    if not settings.EMBEDDING_CACHE_PATH:
+        return
+
+    try:
+        data = np.asarray(vec, dtype=np.float32).tobytes()
+        with _lock:
+            conn = _get_conn()
+            conn.execute('INSERT OR REPLACE INTO emb VALUES (?, ?)', (_cache_key(text), data))
+            conn.commit()
+    except Exception as e:
+        logger.warning(f'Embedding cache write failed: {e}')
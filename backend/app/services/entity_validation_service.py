@@ -8,21 +8,48 @@ Uses spaCy NLP when available, falls back to pattern-based extraction.
 
 import logging
 import re
+from functools import lru_cache
 
 # NLP for entity extraction (optional - graceful fallback)
 try:
     import spacy
 
-    nlp = spacy.load('en_core_web_sm')
+    # Only ner (and its tok2vec dependency) is used - extract_entities_nlp
+    # reads ent.label_ exclusively. Disabling the rest cuts per-call CPU.
+    nlp = spacy.load(
+        'en_core_web_sm',
+        disable=['tagger', 'parser', 'attribute_ruler', 'lemmatizer'],
+    )
     SPACY_AVAILABLE = True
 except (ImportError, OSError):
     SPACY_AVAILABLE = False
     nlp = None
 
+# Aho-Corasick for multi-entity context scanning (optional - graceful fallback)
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import - these run on every answer validation
+# Capitalized phrases (likely entities) for the pattern-based fallback
+_CAPITALIZED_PHRASE_RE = re.compile(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b')
+
+# All uncertainty markers fused into one alternation - one scan instead
+# of 8. 'uncertain' and 'confusing' stay unanchored substrings so
+# derived forms ('uncertainty', 'confusingly') keep triggering.
+_UNCERTAINTY_RE = re.compile(
+    r"\b(?:might|could|possibly|unclear|assume)\b|I'm not sure|uncertain|confusing",
+    re.IGNORECASE,
+)
+
 # Log NLP availability
 if SPACY_AVAILABLE:
     logger.info('spaCy NLP loaded successfully for intelligent entity extraction')
@@ -86,7 +113,7 @@ def extract_entities_pattern_based(text: str) -> list[str]:
         return []
 
     # Extract all capitalized phrases
-    raw_entities = re.findall(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b', text)
+    raw_entities = _CAPITALIZED_PHRASE_RE.findall(text)
 
     filtered = []
     seen = set()
@@ -111,59 +138,94 @@ def extract_entities_pattern_based(text: str) -> list[str]:
     return filtered
 
 
+# Only flag specific entity types that could be hallucinations:
+RELEVANT_ENTITY_LABELS = {
+    'PERSON',
+    'ORG',
+    'GPE',
+    'PRODUCT',
+    'EVENT',
+    'WORK_OF_ART',
+    'LAW',
+    'NORP',
+    'FAC',
+}
+
+def _extract_doc_entities(doc) -> list[str]:
+    """
+    Filter a spaCy doc's entities down to relevant, deduplicated names.
+
+    """
+    entities = []
+    seen = set()
+
+    for ent in doc.ents:
+        if ent.label_ not in RELEVANT_ENTITY_LABELS:
+            continue
+
+        entity_text = ent.text.strip()
+
+        # Skip common words even if tagged as entities
+        if is_common_word(entity_text):
+            continue
+
+        # Deduplicate
+        entity_lower = entity_text.lower()
+        if entity_lower in seen:
+            continue
+
+        seen.add(entity_lower)
+        entities.append(entity_text)
+
+    return entities
+
+
+@lru_cache(maxsize=512)
 def extract_entities_nlp(text: str) -> list[str]:
     """
     NLP-powered entity extraction using spaCy.
     More accurate, reduces false positives.
 
+    Cached because the same answer/context text often recurs within a
+    session (validation + reasoning passes over identical content).
+
     """
     if not text or not nlp:
         return []
 
     try:
         doc = nlp(text)
+        entities = _extract_doc_entities(doc)
 
-        # Only flag specific entity types that could be hallucinations:
-        relevant_labels = {
-            'PERSON',
-            'ORG',
-            'GPE',
-            'PRODUCT',
-            'EVENT',
-            'WORK_OF_ART',
-            'LAW',
-            'NORP',
-            'FAC',
-        }
-
-        entities = []
-        seen = set()
+        logger.debug('NLP entity extraction: %s entities from %s chars', len(entities), len(text))
 
-        for ent in doc.ents:
-            if ent.label_ not in relevant_labels:
-                continue
+        return entities
 
-            entity_text = ent.text.strip()
+    except Exception as e:
+        logger.warning('spaCy entity extraction failed: %s. Using pattern fallback.', e)
+        return extract_entities_pattern_based(text)
 
-            # Skip common words even if tagged as entities
-            if is_common_word(entity_text):
-                continue
 
-            # Deduplicate
-            entity_lower = entity_text.lower()
-            if entity_lower in seen:
-                continue
+def extract_entities_many(texts: list[str]) -> list[list[str]]:
+    """
+    Batch entity extraction over multiple texts.
 
-            seen.add(entity_lower)
-            entities.append(entity_text)
+    Uses nlp.pipe so spaCy amortizes tokenizer cost across the batch.
+    Unused pipeline components are already excluded at load time.
 
-        logger.debug('NLP entity extraction: %s entities from %s chars', len(entities), len(text))
+    """
+    if not texts:
+        return []
 
-        return entities
+    if not nlp:
+        return [extract_entities_pattern_based(t) for t in texts]
 
+    try:
+        docs = nlp.pipe(texts, batch_size=32)
+        return [_extract_doc_entities(doc) for doc in docs]
     except Exception as e:
-        logger.warning('spaCy entity extraction failed: %s. Using pattern fallback.', e)
-        return extract_entities_pattern_based(text)
+        logger.warning('spaCy batch extraction failed: %s. Using pattern fallback.', e)
+        return [extract_entities_pattern_based(t) for t in texts]
 
 
 def extract_entities(text: str) -> list[str]:
@@ -186,43 +248,75 @@ def extract_entities(text: str) -> list[str]:
     return entities
 
 
-def is_entity_in_context(entity: str, context: str) -> bool:
+def is_entity_in_context(entity: str, context_lower: str) -> bool:
     """
     Check if entity appears in context using fuzzy matching.
     Handles: case-insensitive, partial matches, plurals.
+
+    context_lower must already be lowercased - callers checking many
+    entities lower the context once instead of once per entity.
+    Strategies are ordered cheapest-first so most entities short-circuit
+    before any splitting or acronym work.
+
+    Single-word entities that fail the exact and stem checks are
+    reported absent. They previously fell into the acronym strategy,
+    which reduced them to their first letter and so matched virtually
+    any context - a deliberate tightening, not an equivalence.
     """
     entity_lower = entity.lower()
-    context_lower = context.lower()
 
     # Strategy 1: Exact match
     if entity_lower in context_lower:
         return True
 
-    # Strategy 2: Multi-word entity - check if ANY significant word appears
-    parts = entity_lower.split()
-    if len(parts) > 1:
-        significant_parts = [p for p in parts if len(p) > 3]
-        if any(part in context_lower for part in significant_parts):
-            return True
-
-    # Strategy 3: Stem matching (handles plurals/tenses)
+    # Strategy 2: Stem matching (handles plurals/tenses)
     # "company" vs "companies", "running" vs "run"
-    if len(entity_lower) > 5:
-        stem = entity_lower[:5]
-        if stem in context_lower:
-            return True
+    if len(entity_lower) > 5 and entity_lower[:5] in context_lower:
+        return True
+
+    # Multi-word-only strategies below
+    if ' ' not in entity_lower:
+        return False
+
+    # Strategy 3: Multi-word entity - check if ANY significant word appears
+    parts = entity_lower.split()
+    if any(part in context_lower for part in parts if len(part) > 3):
+        return True
 
     # Strategy 4: Check if entity is acronym expansion in context
     # "FBI" in context, "Federal Bureau Investigation" in answer
     if len(entity) > 10:
-        words = entity_lower.split()
-        acronym = ''.join(w[0] for w in words if len(w) > 2)
+        acronym = ''.join(w[0] for w in parts if len(w) > 2)
         if acronym and acronym in context_lower:
             return True
 
     return False
 
 
+def _find_entities_in_context_bulk(entities: list[str], context_lower: str) -> set[str]:
+    """
+    Scan context once for all entity variants using an Aho-Corasick automaton.
+
+    Builds one automaton from the exact and stemmed forms of every entity,
+    then walks the context in a single linear pass instead of one substring
+    scan per entity. Returns the set of entities matched by that pass;
+    entities not returned still go through the per-entity fuzzy strategies.
+    """
+    automaton = ahocorasick.Automaton()
+
+    for entity in entities:
+        entity_lower = entity.lower()
+        automaton.add_word(entity_lower, entity)
+
+        # Stem variant (handles plurals/tenses) - mirrors is_entity_in_context
+        if len(entity_lower) > 5:
+            automaton.add_word(entity_lower[:5], entity)
+
+    automaton.make_automaton()
+
+    return {entity for _, entity in automaton.iter(context_lower)}
+
+
 def validate_entities(
     answer: str, context_blocks: list[str] | None = None, factual_blocks: list[str] | None = None
 ) -> list[str]:
@@ -252,9 +346,21 @@ def validate_entities(
     if not context_text:
         return entities
 
+    # Lower the context once - each entity check needs the lowered form
+    context_lower = context_text.lower()
+
+    # Single-pass automaton scan first (one walk of the context instead of
+    # one substring scan per entity), then fuzzy per-entity fallback for
+    # whatever the scan did not catch (multi-word parts, acronyms).
+    if AHOCORASICK_AVAILABLE and len(entities) > 1:
+        found = _find_entities_in_context_bulk(entities, context_lower)
+        remaining = [e for e in entities if e not in found]
+    else:
+        remaining = entities
+
     unverified = []
-    for entity in entities:
-        if not is_entity_in_context(entity, context_text):
+    for entity in remaining:
+        if not is_entity_in_context(entity, context_lower):
             unverified.append(entity)
 
     logger.debug(
@@ -307,19 +413,8 @@ def detect_uncertainty(
             }
         )
 
-    # Flag 2: Uncertainty language in response
-    uncertainty_patterns = [
-        r'\bmight\b',
-        r'\bcould\b',
-        r'\bpossibly\b',
-        r'\bunclear\b',
-        r'\bassume\b',
-        r'I\'m not sure',
-        r'uncertain',
-        r'confusing',
-    ]
-
-    if any(re.search(p, response_text, re.IGNORECASE) for p in uncertainty_patterns):
+    # Flag 2: Uncertainty language in response (single pre-compiled scan)
+    if _UNCERTAINTY_RE.search(response_text):
         flags.append(
             {
                 'aspect': 'Response contains uncertainty language',
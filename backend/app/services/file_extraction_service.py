@@ -5,7 +5,7 @@ Extracts text content from various file formats.
 Supports PDF, DOCX, and plain text files.
 
 Supported Formats:
-- .pdf: PyPDF2 library
+- .pdf: PyMuPDF library (PyPDF2 fallback)
 - .docx: python-docx library
 - .doc: Not supported (requires conversion to .docx)
 - Text files: Direct UTF-8 decoding
@@ -14,17 +14,54 @@ Features:
 - Automatic format detection based on file extension
 - Content truncation to prevent memory issues
 - Error handling with user-friendly messages
-- Encoding fallback (UTF-8 -> Latin-1)
+- Encoding detection (UTF-8 fast path -> charset-normalizer)
 - File attachment persistence to MongoDB
 """
 
+import gc
+import hashlib
 import io
 import logging
 import uuid
 from datetime import datetime, timedelta
 
+from bson import Binary
+
 from app.config.settings import settings
-from app.core.db import file_attachments_collection
+from app.core.db import extraction_cache_collection, file_attachments_collection
+
+# PDF parsing: PyMuPDF preferred (native MuPDF engine, much faster on
+# multi-page documents), PyPDF2 as pure-Python fallback
+try:
+    import fitz  # PyMuPDF
+
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    fitz = None
+
+# Encoding detection: charset-normalizer scans the bytes once and rules
+# out encodings properly (optional - trial-decode fallback)
+try:
+    from charset_normalizer import from_bytes as detect_charset
+
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+    detect_charset = None
+
+# Attachment content compression: extracted text compresses 3-5x with
+# zstd, shrinking the BSON payload and stored pages (optional - raw
+# binary fallback)
+try:
+    import zstandard as zstd
+
+    ZSTD_AVAILABLE = True
+    _zstd_compressor = zstd.ZstdCompressor(level=3)
+    _zstd_decompressor = zstd.ZstdDecompressor()
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstd = None
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +81,14 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
 
     logger.info(f'Extracting content from {filename} ({len(file_content)} bytes)')
 
+    # Re-uploads of the same file are common in multi-turn chat; cached
+    # extraction skips the parse entirely
+    digest = hashlib.blake2b(file_content, digest_size=16).hexdigest()
+    cached = _get_cached_extraction(digest)
+    if cached is not None:
+        logger.info(f'Extraction cache hit for {filename} ({len(cached)} chars)')
+        return cached
+
     try:
         if filename_lower.endswith('.pdf'):
             content = extract_from_pdf(file_content)
@@ -60,6 +105,8 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
         # Truncate using centralized limit
         content = truncate_content(content)
 
+        _cache_extraction(digest, content)
+
         logger.info(f'Successfully extracted {len(content)} chars from {filename}')
         return content
 
@@ -68,14 +115,80 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
         raise ValueError(f'Failed to extract content from {filename}: {str(e)}')
 
 
+def _get_cached_extraction(digest: str) -> str | None:
+    # Cache problems must never break an upload
+    try:
+        doc = extraction_cache_collection.find_one({'digest': digest}, {'_id': 0, 'content': 1})
+        return doc['content'] if doc else None
+    except Exception as e:
+        logger.warning(f'Extraction cache lookup failed: {e}')
+        return None
+
+
+def _cache_extraction(digest: str, content: str) -> None:
+    try:
+        extraction_cache_collection.update_one(
+            {'digest': digest},
+            {'$set': {'content': content}, '$setOnInsert': {'created_at': datetime.utcnow()}},
+            upsert=True,
+        )
+    except Exception as e:
+        logger.warning(f'Extraction cache write failed: {e}')
+
+
 def extract_from_pdf(file_content: bytes) -> str:
     """
-    Extract text from PDF file using PyPDF2.
+    Extract text from PDF file.
 
     Reads all pages and concatenates text content.
-    Handles various PDF formats and encodings.
+    Uses PyMuPDF when installed (page parsing runs in native code),
+    otherwise falls back to PyPDF2.
 
     """
+    try:
+        if PYMUPDF_AVAILABLE:
+            return _extract_pdf_pymupdf(file_content)
+        return _extract_pdf_pypdf2(file_content)
+    finally:
+        # Parser arenas survive the parse in a long-running service; a
+        # collection here returns them promptly (uploads are infrequent
+        # enough that the pause doesn't matter)
+        gc.collect()
+
+
+def _extract_pdf_pymupdf(file_content: bytes) -> str:
+    # PyMuPDF path: opens the raw bytes directly, no BytesIO wrapper needed
+    doc = fitz.open(stream=file_content, filetype='pdf')
+
+    try:
+        text_parts = []
+        total = 0
+        for page_num, page in enumerate(doc):
+            try:
+                text = page.get_text('text')
+            except Exception as e:
+                logger.warning(f'Failed to extract page {page_num + 1}: {e}')
+                continue
+
+            if text.strip():
+                part = f'--- Page {page_num + 1} ---\n{text}'
+                text_parts.append(part)
+                total += len(part) + 2  # account for the '\n\n' joiner
+
+                # Everything past the cap gets truncated anyway - stop early
+                if total >= FILE_UPLOAD_MAX_CHARS:
+                    logger.info(f'PDF extraction stopped at page {page_num + 1} (char cap reached)')
+                    break
+
+        if not text_parts:
+            raise ValueError('No text content found in PDF')
+
+        return '\n\n'.join(text_parts)
+    finally:
+        doc.close()
+
+
+def _extract_pdf_pypdf2(file_content: bytes) -> str:
     try:
         import PyPDF2
 
@@ -83,11 +196,21 @@ def extract_from_pdf(file_content: bytes) -> str:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
 
         text_parts = []
+        total = 0
         for page_num, page in enumerate(pdf_reader.pages):
             try:
                 text = page.extract_text()
                 if text.strip():
-                    text_parts.append(f'--- Page {page_num + 1} ---\n{text}')
+                    part = f'--- Page {page_num + 1} ---\n{text}'
+                    text_parts.append(part)
+                    total += len(part) + 2  # account for the '\n\n' joiner
+
+                    # Everything past the cap gets truncated anyway - stop early
+                    if total >= FILE_UPLOAD_MAX_CHARS:
+                        logger.info(
+                            f'PDF extraction stopped at page {page_num + 1} (char cap reached)'
+                        )
+                        break
             except Exception as e:
                 logger.warning(f'Failed to extract page {page_num + 1}: {e}')
                 continue
@@ -104,27 +227,54 @@ def extract_from_pdf(file_content: bytes) -> str:
 def extract_from_docx(file_content: bytes) -> str:
     """
     Extract text from .docx file.
+
+    Parsing runs in a helper so the Document and its lxml tree are out of
+    scope before the collection below; python-docx/lxml otherwise hold
+    large XML arenas long after the upload finished.
+
     """
+    try:
+        return _extract_docx_text(file_content)
+    finally:
+        gc.collect()
+
+
+def _extract_docx_text(file_content: bytes) -> str:
     try:
         from docx import Document
 
+        # python-docx requires a file-like object; close it as soon as
+        # parsing is done so the buffer doesn't outlive the extraction
         docx_file = io.BytesIO(file_content)
-        doc = Document(docx_file)
+        try:
+            doc = Document(docx_file)
+        finally:
+            docx_file.close()
 
         text_parts = []
+        total = 0
 
-        # Extract paragraphs
+        # Extract paragraphs (stop once past the char cap - everything
+        # beyond it gets truncated anyway)
         for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
+            if text := para.text.strip():
                 text_parts.append(text)
-
-        # Extract tables
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = ' | '.join(cell.text.strip() for cell in row.cells)
-                if row_text.strip():
-                    text_parts.append(row_text)
+                total += len(text) + 2
+                if total >= FILE_UPLOAD_MAX_CHARS:
+                    break
+
+        # Extract tables - read each cell's text once (every .text access
+        # walks the underlying XML)
+        if total < FILE_UPLOAD_MAX_CHARS:
+            for table in doc.tables:
+                for row in table.rows:
+                    cells = [cell.text.strip() for cell in row.cells]
+                    if any(cells):
+                        row_text = ' | '.join(cells)
+                        text_parts.append(row_text)
+                        total += len(row_text) + 2
+                if total >= FILE_UPLOAD_MAX_CHARS:
+                    break
 
         if not text_parts:
             raise ValueError('No text content found in Word document')
@@ -140,17 +290,39 @@ def extract_from_docx(file_content: bytes) -> str:
 def extract_as_text(file_content: bytes) -> str:
     """
     Extract content as plain text with encoding detection.
-    """
-    # Try common encodings
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
 
-    for encoding in encodings:
-        try:
-            text = file_content.decode(encoding)
+    UTF-8 is tried directly first (the overwhelmingly common case), then
+    charset-normalizer detects the real encoding in a single byte scan.
+    The previous utf-8/latin-1 trial loop silently mojibake'd cp1252
+    content because latin-1 never fails to decode.
+    """
+    # Fastest path: most uploads are pure ASCII, and isascii() is a
+    # single C-level scan - skip the decoding trials entirely
+    if file_content.isascii():
+        text = file_content.decode('ascii')
+        if text.strip():
+            return text.strip()
+
+    # Fast path: valid UTF-8 needs no detection
+    try:
+        text = file_content.decode('utf-8')
+        if text.strip():
+            return text.strip()
+    except (UnicodeDecodeError, AttributeError):
+        pass
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = detect_charset(file_content).best()
+        if best is not None:
+            text = str(best)
             if text.strip():
                 return text.strip()
-        except (UnicodeDecodeError, AttributeError):
-            continue
+    else:
+        # Fallback: latin-1 decodes any byte sequence (lossy for cp1252
+        # punctuation, but better than rejecting the file)
+        text = file_content.decode('latin-1')
+        if text.strip():
+            return text.strip()
 
     raise ValueError('Unable to decode file content as text')
 
@@ -174,47 +346,121 @@ def truncate_content(content: str, max_chars: int = None) -> str:
 # ============================================================
 
 
-def store_file_attachment(
+def _build_file_attachment_doc(
     session_id: str,
     filename: str,
     content: str,
     file_type: str,
+    now: datetime,
 ) -> dict:
-    # Store an uploaded file attachment to database
+    # Build the attachment document for insertion
     if len(content) > settings.FILE_ATTACHMENT_MAX_CHARS:
         content = content[: settings.FILE_ATTACHMENT_MAX_CHARS]
         logger.warning(f'File {filename} truncated to {settings.FILE_ATTACHMENT_MAX_CHARS} chars')
 
-    expires_at = datetime.utcnow() + timedelta(days=settings.FILE_ATTACHMENT_EXPIRY_DAYS)
+    # Encode once: the bytes serve both the size field and the stored
+    # value (Binary skips BSON's UTF-8 string validation on insert)
+    encoded = content.encode('utf-8')
 
-    file_attachment = {
+    doc = {
         'id': str(uuid.uuid4()),
         'session_id': session_id,
         'filename': filename,
         'file_type': file_type,
-        'size_bytes': len(content.encode()),
+        'size_bytes': len(encoded),
         'size_chars': len(content),
-        'content': content,
-        'uploaded_at': datetime.utcnow(),
-        'expires_at': expires_at,
+        'uploaded_at': now,
+        'expires_at': now + timedelta(days=settings.FILE_ATTACHMENT_EXPIRY_DAYS),
     }
 
+    if ZSTD_AVAILABLE:
+        doc['content_zstd'] = Binary(_zstd_compressor.compress(encoded))
+        doc['compression'] = 'zstd'
+    else:
+        doc['content'] = Binary(encoded)
+
+    return doc
+
+
+def store_file_attachment(
+    session_id: str,
+    filename: str,
+    content: str,
+    file_type: str,
+) -> dict:
+    # Store an uploaded file attachment to database
+    file_attachment = _build_file_attachment_doc(
+        session_id, filename, content, file_type, datetime.utcnow()
+    )
+
     result = file_attachments_collection.insert_one(file_attachment)
     file_attachment['_id'] = result.inserted_id
+    _decode_attachment_content(file_attachment)
     logger.info(f'File attachment stored: {filename} (ID: {file_attachment["id"]})')
     return file_attachment
 
 
+def store_file_attachments_bulk(session_id: str, items: list[dict]) -> list[dict]:
+    """
+    Store multiple uploaded file attachments in one database round trip.
+
+    Each item needs 'filename', 'content' and 'file_type' keys.
+    Uses insert_many(ordered=False) so N uploads cost one round trip
+    instead of N.
+
+    """
+    if not items:
+        return []
+
+    now = datetime.utcnow()
+    docs = [
+        _build_file_attachment_doc(
+            session_id,
+            item['filename'],
+            item['content'],
+            item['file_type'],
+            now,
+        )
+        for item in items
+    ]
+
+    result = file_attachments_collection.insert_many(docs, ordered=False)
+    for doc, inserted_id in zip(docs, result.inserted_ids):
+        doc['_id'] = inserted_id
+        _decode_attachment_content(doc)
+
+    logger.info(f'Stored {len(docs)} file attachments for session {session_id}')
+    return docs
+
+
 def get_file_attachment(file_id: str) -> dict | None:
     # Retrieve a file attachment
-    return file_attachments_collection.find_one({'id': file_id}, {'_id': 0})
+    doc = file_attachments_collection.find_one({'id': file_id}, {'_id': 0})
+    if doc is not None:
+        _decode_attachment_content(doc)
+    return doc
+
+
+def _decode_attachment_content(doc: dict) -> None:
+    # Content is stored zstd-compressed (or as raw binary UTF-8; older
+    # documents hold a plain string) - callers always see a str
+    compressed = doc.pop('content_zstd', None)
+    if compressed is not None:
+        if not ZSTD_AVAILABLE:
+            raise ValueError('Attachment is zstd-compressed but zstandard is not installed')
+        doc['content'] = _zstd_decompressor.decompress(bytes(compressed)).decode('utf-8')
+        return
+
+    content = doc.get('content')
+    if isinstance(content, bytes):
+        doc['content'] = content.decode('utf-8')
 
 
 def list_file_attachments(session_id: str) -> list[dict]:
     # List file attachments for a session (without content)
     cursor = file_attachments_collection.find(
         {'session_id': session_id},
-        {'_id': 0, 'content': 0},
+        {'_id': 0, 'content': 0, 'content_zstd': 0},
     ).sort('uploaded_at', -1)
     return list(cursor)
 
@@ -6,21 +6,40 @@ Uses semantic search with embeddings for intelligent context matching
 
 """
 
+import asyncio
 import logging
+import re
 import uuid
 from datetime import datetime
 
-from bson import ObjectId
+import numpy as np
+from bson import Binary, ObjectId
 from bson.errors import InvalidId
+from cachetools import LRUCache, TTLCache
 
 from app.config.settings import settings
 from app.core.db import (
     sessions_collection,
     synthesized_memory_collection,
 )
-from app.services.embedding_service import cosine_similarity, embed
+from app.services.embedding_service import (
+    dequantize_embedding,
+    embed_batched,
+    embed_query,
+    quantize_embedding,
+)
 from app.services.ollama_service import call_ollama_once
 
+# Approximate nearest neighbour search: hnswlib makes large-session
+# memory search sub-linear (optional - brute-force matmul fallback)
+try:
+    import hnswlib
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+    hnswlib = None
+
 logger = logging.getLogger(__name__)
 
 # Import centralized settings
@@ -31,40 +50,178 @@ MEMORY_DB_QUERY_LIMIT = settings.MEMORY_DB_QUERY_LIMIT
 MEMORY_TEXT_FALLBACK_LIMIT = settings.MEMORY_TEXT_FALLBACK_LIMIT
 MEMORY_KEY_TRUNCATION_LIMIT = settings.MEMORY_KEY_TRUNCATION_LIMIT
 MEMORY_LOG_TRUNCATION_LIMIT = settings.MEMORY_LOG_TRUNCATION_LIMIT
+MEMORY_DEFAULT_CONFIDENCE = settings.MEMORY_DEFAULT_CONFIDENCE
+
+# should_remember trigger phrases, fused into single compiled scans
+_REMEMBER_REJECT_RE = re.compile(r'dont remember')
+_REMEMBER_ACCEPT_RE = re.compile(r'remember|save this|keep in mind')
+
+# Constant prompt text built once instead of re-rendered per call
+_COMPRESS_PROMPT_PREFIX = """
+Summarize the following memories into a concise.
+Structured in long-term memory.
+Do not lose important facts.
+Do not add explanation.
+
+Memories:
+"""
+
+_SUMMARIZE_PROMPT_PREFIX = """
+Summarize the following content into a single concise fact.
+Do NOT add explanation.
+
+Content:
+"""
 
 
 def serialize_memory(doc: dict) -> dict:
-    # Convert synthesized memory document to API-friendly format
+    # Convert synthesized memory document to API-friendly format.
+    # Called once per document in listing and search paths - bind the
+    # lookup method once instead of eight attribute resolutions
+    doc_get = doc.get
     return {
-        'id': doc.get('id') or str(doc.get('_id')),
-        'content': doc.get('value') or doc.get('content') or doc.get('fact') or '',
-        'enabled': doc.get('enabled', True),
-        'created_at': doc.get('created_at'),
-        'chat_sessionId': doc.get('session_id') or doc.get('chat_sessionId'),
-        'category': doc.get('category', 'other'),
-        'source': doc.get('source', 'manual'),
-        'confidence': doc.get('confidence', settings.MEMORY_DEFAULT_CONFIDENCE),
+        'id': doc_get('id') or str(doc_get('_id')),
+        'content': doc_get('value') or doc_get('content') or doc_get('fact') or '',
+        'enabled': doc_get('enabled', True),
+        'created_at': doc_get('created_at'),
+        'chat_sessionId': doc_get('session_id') or doc_get('chat_sessionId'),
+        'category': doc_get('category', 'other'),
+        'source': doc_get('source', 'manual'),
+        'confidence': doc_get('confidence', MEMORY_DEFAULT_CONFIDENCE),
     }
 
 
+def _embedding_fields(embedding: list[float]) -> dict:
+    """
+    Build the storage representation of an embedding.
+
+    int8 mode stores a quarter of the bytes; search handles both formats.
+    Embeddings arrive unit-normalized from embed(), which search relies
+    on to score with a bare dot product.
+
+    """
+    if settings.MEMORY_EMBEDDING_INT8:
+        data, scale = quantize_embedding(embedding)
+        return {'embedding_i8': Binary(data), 'embedding_scale': scale}
+    return {'embedding': embedding}
+
+
+def _decode_doc_embedding(doc: dict, dim: int) -> np.ndarray | None:
+    """
+    Read a document's embedding in either storage format.
+
+    Returns None when the document has no usable embedding of the
+    expected dimensionality.
+
+    """
+    emb = doc.get('embedding')
+    if isinstance(emb, list) and len(emb) == dim:
+        return np.asarray(emb, dtype=np.float32)
+
+    raw = doc.get('embedding_i8')
+    scale = doc.get('embedding_scale')
+    if raw is not None and scale:
+        arr = dequantize_embedding(bytes(raw), scale)
+        if arr.shape[0] == dim:
+            return arr
+
+    return None
+
+
+# Listing paths never read the embedding - keep it out of the BSON
+# transfer (it dominates document size)
+_LIST_PROJECTION = {'embedding': 0, 'embedding_i8': 0}
+
+
+def _truncate_doc_content(doc: dict) -> None:
+    # Truncate content to max chars per item (in place)
+    content = doc.get('value') or doc.get('content', '')
+    if len(content) > MAX_CHARS_PER_ITEM:
+        if doc.get('value'):
+            doc['value'] = content[:MAX_CHARS_PER_ITEM] + '...'
+        else:
+            doc['content'] = content[:MAX_CHARS_PER_ITEM] + '...'
+
+
+def _search_memories_vector_index(
+    chat_sessionId: str, query_vec: list[float], limit: int, threshold: float
+) -> list[dict]:
+    """
+    Score memories server-side with an Atlas $vectorSearch index.
+
+    The index narrows candidates in the database and returns only the
+    top results, so no embeddings cross the wire. Atlas reports cosine
+    scores normalized to [0, 1]; they are mapped back to [-1, 1] before
+    applying the similarity threshold.
+
+    """
+    pipeline = [
+        {
+            '$vectorSearch': {
+                'index': settings.MEMORY_VECTOR_SEARCH_INDEX,
+                'path': 'embedding',
+                'queryVector': query_vec,
+                'numCandidates': max(MEMORY_DB_QUERY_LIMIT, limit * 10),
+                'limit': limit,
+                'filter': {
+                    'session_id': chat_sessionId,
+                    'is_deprecated': {'$ne': True},
+                    # Disabled docs filtered here, not client-side, so
+                    # they don't eat into 'limit'
+                    'enabled': {'$ne': False},
+                },
+            }
+        },
+        {'$addFields': {'search_score': {'$meta': 'vectorSearchScore'}}},
+        {'$project': {'embedding': 0}},
+    ]
+
+    results = []
+    for doc in synthesized_memory_collection.aggregate(pipeline):
+        similarity = 2 * doc.get('search_score', 0.0) - 1
+        if similarity < threshold:
+            continue
+        _truncate_doc_content(doc)
+        results.append(serialize_memory(doc))
+    return results
+
+
+# Per-session memory limits change rarely but were fetched on every
+# search - cache them briefly to skip the round trip
+_memory_limit_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
 def get_session_memory_limit(session_id: str) -> int | None:
     """
     Get custom memory search limit for a session.
 
     Sessions can override default memory limit via rules.memorySearchLimit.
     Used to control how many memories are returned in search results.
+    Results are cached for a minute; invalidate_session_memory_limit
+    drops the entry when session rules change.
 
     """
+    if session_id in _memory_limit_cache:
+        return _memory_limit_cache[session_id]
+
     try:
         session = sessions_collection.find_one({'id': session_id}, {'rules.memorySearchLimit': 1})
+        limit = None
         if session and session.get('rules'):
-            return session['rules'].get('memorySearchLimit')
-        return None
+            limit = session['rules'].get('memorySearchLimit')
+
+        _memory_limit_cache[session_id] = limit
+        return limit
     except Exception as e:
         logger.error(f'Error fetching memory limit for session {session_id}: {e}')
         return None
 
 
+def invalidate_session_memory_limit(session_id: str) -> None:
+    # Drop the cached limit after a session rules update
+    _memory_limit_cache.pop(session_id, None)
+
+
 def add_memory(
     content: str,
     chat_sessionId: str,
@@ -78,27 +235,29 @@ def add_memory(
         content = content[: settings.MEMORY_MAX_CONTENT_LENGTH]
 
     try:
-        embedding = embed([content])[0]
+        embedding = embed_query(content)
     except Exception as e:
         raise ValueError(f'Failed to generate embedding: {e}')
 
+    now = datetime.utcnow()
     memory = {
         'id': str(uuid.uuid4()),
         'session_id': chat_sessionId,
         'key': content.strip()[:MEMORY_KEY_TRUNCATION_LIMIT],
         'value': content.strip(),
-        'embedding': embedding,
+        **_embedding_fields(embedding),
         'source': source,
         'category': category,
         'confidence': settings.MEMORY_DEFAULT_CONFIDENCE,
         'tags': [category],
         'enabled': True,
         'is_deprecated': False,
-        'created_at': datetime.utcnow(),
-        'last_referenced_at': datetime.utcnow(),
+        'created_at': now,
+        'last_referenced_at': now,
     }
     result = synthesized_memory_collection.insert_one(memory)
     memory['_id'] = result.inserted_id
+    _invalidate_session_ann(chat_sessionId)
     return serialize_memory(memory)
 
 
@@ -110,9 +269,10 @@ def list_all_memories(chat_sessionId: str):
     Used for listing UI to show all stored memories.
 
     """
-    cursor = synthesized_memory_collection.find({'session_id': chat_sessionId}).sort(
-        'created_at', 1
-    )
+    cursor = synthesized_memory_collection.find(
+        {'session_id': chat_sessionId},
+        _LIST_PROJECTION,
+    ).sort('created_at', 1)
     return [serialize_memory(doc) for doc in cursor]
 
 
@@ -138,6 +298,9 @@ def set_memory_enabled(memory_id: str, enabled: bool):
     if not result or result.matched_count == 0:
         raise ValueError('Invalid memory id')
 
+    # Session isn't known from the id alone - drop all ANN indexes
+    _invalidate_session_ann()
+
 
 def list_enabled_memories(chat_sessionId: str):
     """
@@ -146,16 +309,42 @@ def list_enabled_memories(chat_sessionId: str):
     Excludes disabled memories.
     Used for context selection in chat responses.
 
+    The $project stage shapes documents server-side into the same form
+    serialize_memory produces, so the driver streams ready-made results
+    with no per-document Python rebuild. ($ifNull keeps missing-field
+    semantics; unlike the Python fallbacks it passes empty strings
+    through, which no current writer produces.)
+
     """
-    cursor = synthesized_memory_collection.find(
-        {
-            'session_id': chat_sessionId,
-            'is_deprecated': {'$ne': True},
-            '$or': [{'enabled': True}, {'enabled': {'$exists': False}}],
-        }
-    ).sort('created_at', 1)
+    cursor = synthesized_memory_collection.aggregate(
+        [
+            {
+                '$match': {
+                    'session_id': chat_sessionId,
+                    'is_deprecated': {'$ne': True},
+                    '$or': [{'enabled': True}, {'enabled': {'$exists': False}}],
+                }
+            },
+            {'$sort': {'created_at': 1}},
+            {
+                '$project': {
+                    '_id': 0,
+                    'id': {'$ifNull': ['$id', {'$toString': '$_id'}]},
+                    'content': {
+                        '$ifNull': ['$value', {'$ifNull': ['$content', {'$ifNull': ['$fact', '']}]}]
+                    },
+                    'enabled': {'$ifNull': ['$enabled', True]},
+                    'created_at': 1,
+                    'chat_sessionId': {'$ifNull': ['$session_id', '$chat_sessionId']},
+                    'category': {'$ifNull': ['$category', 'other']},
+                    'source': {'$ifNull': ['$source', 'manual']},
+                    'confidence': {'$ifNull': ['$confidence', MEMORY_DEFAULT_CONFIDENCE]},
+                }
+            },
+        ]
+    )
 
-    return [serialize_memory(doc) for doc in cursor]
+    return list(cursor)
 
 
 def list_memories_by_category(chat_sessionId: str, category: str):
@@ -169,7 +358,8 @@ def list_memories_by_category(chat_sessionId: str, category: str):
             'category': category,
             'is_deprecated': {'$ne': True},
             '$or': [{'enabled': True}, {'enabled': {'$exists': False}}],
-        }
+        },
+        _LIST_PROJECTION,
     ).sort('created_at', 1)
 
     return [serialize_memory(doc) for doc in cursor]
@@ -188,6 +378,9 @@ def delete_memory(memory_id: str):
         except InvalidId:
             raise ValueError('Invalid memory id')
 
+    # Session isn't known from the id alone - drop all ANN indexes
+    _invalidate_session_ann()
+
 
 def delete_memories_for_session(chat_sessionId: str) -> int:
     """
@@ -197,6 +390,7 @@ def delete_memories_for_session(chat_sessionId: str) -> int:
 
     """
     result = synthesized_memory_collection.delete_many({'session_id': chat_sessionId})
+    _invalidate_session_ann(chat_sessionId)
     return result.deleted_count
 
 
@@ -232,43 +426,296 @@ def search_memories(chat_sessionId: str, query: str, limit: int = None, threshol
     )
 
     try:
-        query_vec = embed([query])[0]
+        # Cached: repeat queries skip the model forward pass
+        query_vec = embed_query(query)
     except Exception as e:
         logger.error(f'Failed to embed query: {e}')
         return []
 
-    cursor = synthesized_memory_collection.find(
-        {
-            'session_id': chat_sessionId,
-            'is_deprecated': {'$ne': True},
-            '$or': [{'enabled': True}, {'enabled': {'$exists': False}}],
-            'embedding': {'$exists': True},
-        }
-    ).limit(MEMORY_DB_QUERY_LIMIT)
+    # Server-side vector search when an Atlas index is configured
+    if settings.MEMORY_VECTOR_SEARCH_INDEX:
+        try:
+            return _search_memories_vector_index(chat_sessionId, query_vec, limit, threshold)
+        except Exception as e:
+            logger.warning(f'Vector search index failed, scoring client-side: {e}')
 
-    scored = []
-    for doc in cursor:
+    # ANN index for sessions large enough to beat the brute-force path
+    if HNSWLIB_AVAILABLE:
         try:
-            score = cosine_similarity(query_vec, doc['embedding'])
-            if score >= threshold:
-                # Truncate content to max chars per item
-                content = doc.get('value') or doc.get('content', '')
-                if len(content) > MAX_CHARS_PER_ITEM:
-                    if doc.get('value'):
-                        doc['value'] = content[:MAX_CHARS_PER_ITEM] + '...'
-                    else:
-                        doc['content'] = content[:MAX_CHARS_PER_ITEM] + '...'
-
-                scored.append((score, doc))
-        except Exception:
-            continue
+            results = _ann_search(chat_sessionId, query_vec, limit, threshold)
+            if results is not None:
+                return results
+        except Exception as e:
+            logger.warning(f'ANN search failed, scoring brute-force: {e}')
+
+    docs = _fetch_candidate_docs(chat_sessionId, embeddings_only=True)
+    return _score_candidates(docs, query_vec, limit, threshold, chat_sessionId)
+
+
+async def search_memories_async(
+    chat_sessionId: str, query: str, limit: int = None, threshold: float = None
+):
+    """
+    Async variant of search_memories for use from request handlers.
+
+    Overlaps the query embedding (CPU/GPU latency) with the Mongo
+    candidate fetch (network latency) - the two are independent - and
+    keeps both off the event loop.
+
+    """
+    if not query or not query.strip():
+        return []
+
+    if limit is None:
+        session_limit = await asyncio.to_thread(get_session_memory_limit, chat_sessionId)
+        limit = session_limit or settings.MEMORY_SEARCH_LIMIT
+
+    if threshold is None:
+        threshold = settings.MEMORY_SEARCH_THRESHOLD
+
+    logger.info(
+        'Memory search start (query_len=%s, limit=%s, threshold=%s)',
+        len(query),
+        limit,
+        threshold,
+        extra={'session_id': chat_sessionId},
+    )
+
+    if settings.MEMORY_VECTOR_SEARCH_INDEX:
+        try:
+            query_vec = await asyncio.to_thread(embed_query, query)
+            return await asyncio.to_thread(
+                _search_memories_vector_index, chat_sessionId, query_vec, limit, threshold
+            )
+        except Exception as e:
+            logger.warning(f'Vector search index failed, scoring client-side: {e}')
+
+    # ANN path: the index replaces the candidate fetch, so there's no
+    # I/O to overlap - just keep everything off the event loop
+    if HNSWLIB_AVAILABLE:
+        try:
+            query_vec = await asyncio.to_thread(embed_query, query)
+            results = await asyncio.to_thread(
+                _ann_search, chat_sessionId, query_vec, limit, threshold
+            )
+            if results is not None:
+                return results
+            docs = await asyncio.to_thread(
+                _fetch_candidate_docs, chat_sessionId, True, True
+            )
+            return _score_candidates(docs, query_vec, limit, threshold, chat_sessionId)
+        except Exception as e:
+            logger.warning(f'ANN search failed, scoring brute-force: {e}')
+
+    try:
+        query_vec, docs = await asyncio.gather(
+            asyncio.to_thread(embed_query, query),
+            asyncio.to_thread(_fetch_candidate_docs, chat_sessionId, True, True),
+        )
+    except Exception as e:
+        logger.error(f'Failed to embed query or fetch candidates: {e}')
+        return []
+
+    return _score_candidates(docs, query_vec, limit, threshold, chat_sessionId)
+
+
+def _candidate_filter(chat_sessionId: str) -> dict:
+    # Predicate shared by the candidate fetch and the ANN count gate
+    return {
+        'session_id': chat_sessionId,
+        'is_deprecated': {'$ne': True},
+        '$and': [
+            {'$or': [{'enabled': True}, {'enabled': {'$exists': False}}]},
+            {'$or': [{'embedding': {'$exists': True}}, {'embedding_i8': {'$exists': True}}]},
+        ],
+    }
+
+
+def _fetch_candidate_docs(
+    chat_sessionId: str, cap: bool = True, embeddings_only: bool = False
+) -> list[dict]:
+    # Pull the candidate memory documents for client-side scoring.
+    # embeddings_only skips content and metadata - ranking needs just
+    # the vectors, and the winners are hydrated afterwards.
+    projection = None
+    if embeddings_only:
+        projection = {'_id': 1, 'embedding': 1, 'embedding_i8': 1, 'embedding_scale': 1}
+
+    cursor = synthesized_memory_collection.find(_candidate_filter(chat_sessionId), projection)
+    if cap:
+        cursor = cursor.limit(MEMORY_DB_QUERY_LIMIT)
+    return list(cursor)
+
+
+# Per-session HNSW indexes (index + candidate _ids, no document
+# content); entries are dropped on that session's memory mutations,
+# and the LRU bound caps resident memory across many large sessions.
+# _ANN_TOO_SMALL marks sessions below the ANN candidate minimum so
+# repeat searches skip straight to the brute-force path without
+# re-paying the uncapped fetch.
+_ANN_TOO_SMALL = ()
+_session_ann: LRUCache = LRUCache(maxsize=16)
+
+
+def _invalidate_session_ann(session_id: str | None = None) -> None:
+    # None clears everything (used where the session isn't known)
+    if session_id is None:
+        _session_ann.clear()
+    else:
+        _session_ann.pop(session_id, None)
+
 
-    scored.sort(key=lambda x: x[0], reverse=True)
+def _ann_search(
+    chat_sessionId: str, query_vec: list[float], limit: int, threshold: float
+) -> list[dict] | None:
+    """
+    HNSW-backed top-k search over a session's memories.
+
+    Builds the index lazily per session (uncapped, embeddings-only
+    candidate fetch, so large sessions aren't truncated at
+    MEMORY_DB_QUERY_LIMIT) and reuses it until a mutation invalidates
+    it or the LRU evicts it; winners are hydrated from Mongo per query.
+    Returns None when the session is
+    small enough that the brute-force matmul path is cheaper; that
+    outcome is cached too, so small sessions pay one count query per
+    invalidation instead of a full fetch per search.
+
+    """
+    entry = _session_ann.get(chat_sessionId)
+    if entry is _ANN_TOO_SMALL:
+        return None
+    if entry is None:
+        # Cheap count gate before the uncapped document fetch: most
+        # sessions sit below the ANN minimum and the brute-force path
+        # fetches its own (capped, embeddings-only) candidates anyway
+        count = synthesized_memory_collection.count_documents(_candidate_filter(chat_sessionId))
+        if count < settings.MEMORY_ANN_MIN_CANDIDATES:
+            _session_ann[chat_sessionId] = _ANN_TOO_SMALL
+            return None
+
+        dim = len(query_vec)
+        ids = []
+        vectors = []
+        for doc in _fetch_candidate_docs(chat_sessionId, cap=False, embeddings_only=True):
+            arr = _decode_doc_embedding(doc, dim)
+            if arr is not None:
+                ids.append(doc['_id'])
+                vectors.append(arr)
+
+        if len(ids) < settings.MEMORY_ANN_MIN_CANDIDATES:
+            _session_ann[chat_sessionId] = _ANN_TOO_SMALL
+            return None
+
+        index = hnswlib.Index(space='cosine', dim=dim)
+        index.init_index(max_elements=len(ids), M=16, ef_construction=200)
+        index.add_items(np.asarray(vectors, dtype=np.float32), np.arange(len(ids)))
+        index.set_ef(50)
+        entry = (index, ids)
+        _session_ann[chat_sessionId] = entry
+        logger.info(f'Built ANN index for session {chat_sessionId} ({len(ids)} memories)')
+
+    index, ids = entry
+    labels, distances = index.knn_query(
+        np.asarray(query_vec, dtype=np.float32), k=min(limit, len(ids))
+    )
+
+    top_ids = []
+    for label, dist in zip(labels[0], distances[0]):
+        similarity = 1.0 - float(dist)  # cosine space reports distance
+        if similarity >= threshold:
+            top_ids.append(ids[label])
+
+    # Hydrate only the winners, as _score_candidates does: the cache
+    # holds just _ids and vectors, so content and metadata come from
+    # Mongo for at most 'limit' documents
+    hydrated = {
+        d['_id']: d
+        for d in synthesized_memory_collection.find(
+            {'_id': {'$in': top_ids}}, {'embedding': 0, 'embedding_i8': 0}
+        )
+    }
+
+    results = []
+    for oid in top_ids:
+        doc = hydrated.get(oid)
+        if doc is None:
+            continue  # deleted between ranking and hydration
+        _truncate_doc_content(doc)
+        results.append(serialize_memory(doc))
+
+    logger.info(
+        'Memory search results (ann, returned=%s)',
+        len(results),
+        extra={'session_id': chat_sessionId},
+    )
+    return results
+
+
+def _score_candidates(
+    candidates: list[dict],
+    query_vec: list[float],
+    limit: int,
+    threshold: float,
+    chat_sessionId: str,
+) -> list[dict]:
+    # Score, threshold and top-k select the candidate documents
+    query_arr = np.asarray(query_vec, dtype=np.float32)
+    # vdot + sqrt skips linalg.norm's general-case dispatch for the 1-D case
+    query_arr /= float(np.sqrt(np.vdot(query_arr, query_arr))) or 1.0
+
+    # Collect candidates up front, skipping malformed embeddings
+    docs = []
+    embeddings = []
+    for doc in candidates:
+        arr = _decode_doc_embedding(doc, query_arr.shape[0])
+        if arr is not None:
+            docs.append(doc)
+            embeddings.append(arr)
+
+    if not docs:
+        logger.info(
+            'Memory search results (matched=0, returned=0)',
+            extra={'session_id': chat_sessionId},
+        )
+        return []
+
+    # Score all candidates in one matrix-vector product instead of a
+    # Python-level dot per document. Stored embeddings are unit-length
+    # (embed() normalizes at write time; int8 round-trip keeps that to
+    # within quantization error), so no per-doc normalization is needed
+    # and cosine reduces to a plain SGEMV.
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    scores = matrix @ query_arr
+
+    matched = np.flatnonzero(scores >= threshold)
+
+    # Partial top-k selection, then sort only the selected entries
+    if limit < matched.size:
+        matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+    top = matched[np.argsort(-scores[matched])]
+
+    # Hydrate only the winners: the candidate fetch carried just
+    # embeddings, so content and metadata cross the wire for at most
+    # 'limit' documents
+    top_ids = [docs[i]['_id'] for i in top]
+    hydrated = {
+        d['_id']: d
+        for d in synthesized_memory_collection.find(
+            {'_id': {'$in': top_ids}}, {'embedding': 0, 'embedding_i8': 0}
+        )
+    }
+
+    results = []
+    for oid in top_ids:
+        doc = hydrated.get(oid)
+        if doc is None:
+            continue  # deleted between ranking and hydration
+        _truncate_doc_content(doc)
+        results.append(serialize_memory(doc))
 
-    results = [serialize_memory(d[1]) for d in scored[:limit]]
     logger.info(
         'Memory search results (matched=%s, returned=%s)',
-        len(scored),
+        int(np.count_nonzero(scores >= threshold)),
         len(results),
         extra={'session_id': chat_sessionId},
     )
@@ -276,33 +723,44 @@ def search_memories(chat_sessionId: str, query: str, limit: int = None, threshol
 
 
 async def compress_memories(chat_sessionId: str, model: str):
-    memories = list_enabled_memories(chat_sessionId)
+    # Sync PyMongo (and embedding inside add_memory) would block the
+    # event loop - run every blocking step in a worker thread
+    memories = await asyncio.to_thread(list_enabled_memories, chat_sessionId)
 
     if len(memories) < 2:
         return None
 
-    text = '\n'.join(f'- {m["content"]}' for m in memories)
-
-    prompt = f"""
-Summarize the following memories into a concise.
-Structured in long-term memory.
-Do not lose important facts.
-Do not add explanation.
-
-Memories:
-{text}
-"""
+    prompt = _COMPRESS_PROMPT_PREFIX + '\n'.join('- ' + m['content'] for m in memories) + '\n'
 
     try:
         summary = await call_ollama_once(prompt, model)
     except Exception:
         return None
 
-    # Disable old memories after successful compression
-    for m in memories:
-        set_memory_enabled(m['id'], False)
+    # Disable old memories after successful compression - one write for
+    # the whole batch instead of a round trip per memory. Legacy docs
+    # lack the UUID 'id' field and are listed under str(_id), so ids
+    # that parse as ObjectIds are matched on '_id' as well (the same
+    # fallback set_memory_enabled applies per document)
+    ids = [m['id'] for m in memories]
+    legacy_ids = []
+    for memory_id in ids:
+        try:
+            legacy_ids.append(ObjectId(memory_id))
+        except InvalidId:
+            pass
+    disable_filter = {'id': {'$in': ids}}
+    if legacy_ids:
+        disable_filter = {'$or': [disable_filter, {'_id': {'$in': legacy_ids}}]}
+    await asyncio.to_thread(
+        synthesized_memory_collection.update_many,
+        disable_filter,
+        {'$set': {'enabled': False}},
+    )
+    _invalidate_session_ann(chat_sessionId)
 
-    return add_memory(
+    return await asyncio.to_thread(
+        add_memory,
         content=summary,
         chat_sessionId=chat_sessionId,
         source='compress',
@@ -315,34 +773,28 @@ def should_remember(user_text: str, assistant_text: str) -> bool:
     min_assistant = settings.MEMORY_MIN_ASSISTANT_LENGTH or 0
     min_conversation = settings.MEMORY_MIN_CONVERSATION_LENGTH or 0
 
-    if len(assistant_text.strip()) < min_assistant:
+    # Strip and case-normalize once; both checks below reuse the result
+    stripped = assistant_text.strip()
+    if len(stripped) < min_assistant:
         return False
 
     if len(user_text) + len(assistant_text) < min_conversation:
         return False
 
     # Check for reject patterns (case-insensitive, whole message)
-    reject_patterns = ['dont remember']
-    normalized = assistant_text.lower().strip()
-    if any(pattern in normalized for pattern in reject_patterns):
+    normalized = stripped.casefold()
+    if _REMEMBER_REJECT_RE.search(normalized):
         return False
 
     # Check for explicit remember requests
-    accept_patterns = ['remember', 'save this', 'keep in mind']
-    if any(pattern in normalized for pattern in accept_patterns):
+    if _REMEMBER_ACCEPT_RE.search(normalized):
         return True
 
     return True
 
 
 async def summarize(text: str, model: str) -> str:
-    prompt = f"""
-Summarize the following content into a single concise fact.
-Do NOT add explanation.
-
-Content:
-{text}
-"""
+    prompt = _SUMMARIZE_PROMPT_PREFIX + text + '\n'
     try:
         return await call_ollama_once(prompt, model)
     except Exception:
@@ -366,7 +818,10 @@ async def auto_memory_if_needed(
     summary = await summarize(combined, model)
 
     try:
-        return add_memory(
+        # add_memory embeds and writes synchronously - keep it off the
+        # event loop
+        return await asyncio.to_thread(
+            add_memory,
             content=summary,
             chat_sessionId=chat_sessionId,
             source='auto',
@@ -400,10 +855,12 @@ async def add_synthesized_memory(
     embedding = None
     try:
         if fact and fact.strip():
-            embedding = embed([fact])[0]
+            # Batched: concurrent synthesis requests share a forward pass
+            embedding = await embed_batched(fact)
     except Exception as e:
         logger.warning(f'Failed to embed synthesized memory: {e}')
 
+    now = datetime.utcnow()
     memory_item = {
         'id': str(uuid.uuid4()),
         'session_id': session_id,
@@ -414,19 +871,20 @@ async def add_synthesized_memory(
         'source': source,
         'tags': tags,
         'enabled': True,
-        'created_at': datetime.utcnow(),
-        'last_referenced_at': datetime.utcnow(),
+        'created_at': now,
+        'last_referenced_at': now,
         'is_deprecated': False,
     }
 
     if embedding is not None:
-        memory_item['embedding'] = embedding
+        memory_item.update(_embedding_fields(embedding))
 
     if source_file:
         memory_item['source_file'] = source_file
 
     result = synthesized_memory_collection.insert_one(memory_item)
     memory_item['_id'] = result.inserted_id
+    _invalidate_session_ann(session_id)
     logger.info(
         f'Synthesized memory added: {fact[:MEMORY_LOG_TRUNCATION_LIMIT]}... (confidence: {confidence})'
     )
@@ -13,8 +13,44 @@ import httpx
 
 from app.config.settings import settings
 
+# Token stream parsing: orjson decodes each JSON line several times
+# faster than the stdlib parser (optional - stdlib json fallback)
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
 logger = logging.getLogger(__name__)
 
+# Shared client: per-call AsyncClient construction paid a TCP handshake
+# (and pool setup) on every LLM call; keep-alive reuses the connection
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=settings.OLLAMA_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+    return _client
+
+
+async def close_ollama_client() -> None:
+    """
+    Close the shared client (called on application shutdown)
+
+    """
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
 
 async def stream_ollama(prompt: str, model: str, system: Optional[str] = None):
     """
@@ -27,37 +63,49 @@ async def stream_ollama(prompt: str, model: str, system: Optional[str] = None):
         type(system).__name__,
     )
     try:
-        async with httpx.AsyncClient(timeout=settings.OLLAMA_TIMEOUT) as client:
-            # Build request payload
-            payload = {'model': model, 'prompt': prompt, 'stream': True}
-            if system:
-                payload['system'] = system
-                logger.info('Added system to payload')
-
-            logger.info('Ollama stream payload keys: %s', list(payload.keys()))
-            if 'system' in payload:
-                logger.info('  Ollama system prompt (len=%s)', len(payload['system']))
-
-            # Stream response
-            async with client.stream(
-                'POST',
-                f'{settings.OLLAMA_URL}/api/generate',
-                json=payload,
-            ) as resp:
-                resp.raise_for_status()
-
-                async for line in resp.aiter_lines():
+        client = _get_client()
+
+        # Build request payload
+        payload = {'model': model, 'prompt': prompt, 'stream': True}
+        if system:
+            payload['system'] = system
+            logger.info('Added system to payload')
+
+        logger.info('Ollama stream payload keys: %s', list(payload.keys()))
+        if 'system' in payload:
+            logger.info('  Ollama system prompt (len=%s)', len(payload['system']))
+
+        # Stream response
+        async with client.stream(
+            'POST',
+            f'{settings.OLLAMA_URL}/api/generate',
+            json=payload,
+        ) as resp:
+            resp.raise_for_status()
+
+            # Frame JSON lines from raw bytes: aiter_lines would decode
+            # every chunk to str before splitting, paying a full
+            # bytes->str pass per token; the parser takes bytes directly
+            buffer = bytearray()
+            done = False
+            async for chunk in resp.aiter_raw(chunk_size=8192):
+                buffer += chunk
+
+                while not done and (newline := buffer.find(b'\n')) != -1:
+                    line = bytes(buffer[:newline])
+                    del buffer[: newline + 1]
                     if not line:
                         continue
 
                     try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError:
+                        data = _json_loads(line)
+                    except _JSONDecodeError:
                         logger.warning('ollama stream returned non-JSON line: %s', line)
                         continue
 
                     if 'error' in data:
                         logger.error('ollama stream error: %s', data['error'])
+                        done = True
                         break
 
                     # Yield each token
@@ -66,7 +114,10 @@ async def stream_ollama(prompt: str, model: str, system: Optional[str] = None):
 
                     # Stop when done
                     if data.get('done'):
-                        break
+                        done = True
+
+                if done:
+                    break
     except httpx.HTTPError as exc:
         logger.error('ollama stream request failed: %s', exc)
         return
@@ -78,18 +129,19 @@ async def call_ollama_once(prompt: str, model: str, system: Optional[str] = None
 
     """
     try:
-        async with httpx.AsyncClient(timeout=settings.OLLAMA_TIMEOUT) as client:
-            # Build request payload
-            payload = {'model': model, 'prompt': prompt, 'stream': False}
-            if system:
-                payload['system'] = system
-
-            # Make request
-            resp = await client.post(
-                f'{settings.OLLAMA_URL}/api/generate',
-                json=payload,
-            )
-            resp.raise_for_status()
+        client = _get_client()
+
+        # Build request payload
+        payload = {'model': model, 'prompt': prompt, 'stream': False}
+        if system:
+            payload['system'] = system
+
+        # Make request
+        resp = await client.post(
+            f'{settings.OLLAMA_URL}/api/generate',
+            json=payload,
+        )
+        resp.raise_for_status()
     except httpx.HTTPError as exc:
         logger.error('ollama call failed: %s', exc)
         return ''
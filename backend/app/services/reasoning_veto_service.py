@@ -6,8 +6,19 @@ Post-answer reasoning analysis for diagnostic purposes.
 import logging
 import re
 from enum import Enum
+from types import MappingProxyType
 from typing import TypedDict
 
+# Literal-anchor prefilter: one automaton pass decides which veto
+# categories can match at all (optional - full regex pass fallback)
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,61 +95,195 @@ REASONING_SOFT_VETOES = [
 ]
 
 
+# ============================================================
+# COMPILED PATTERNS
+# ============================================================
+# Compiled once at import: the analyzer runs per answer, and searching
+# raw pattern strings paid the re-cache lookup (and a redundant second
+# search to extract the match) for every pattern on every call. The
+# input is lowercased before matching, so no IGNORECASE flag is needed.
+
+# The hard and soft lists are each fused into one alternation, so a
+# call makes a single pass over the text per category instead of one
+# pass per pattern. Named groups recover which pattern fired.
+_HARD_VETO_RE = re.compile('|'.join(f'(?P<h{i}>{p})' for i, p in enumerate(REASONING_HARD_VETOES)))
+_SOFT_VETO_RE = re.compile('|'.join(f'(?P<s{i}>{p})' for i, p in enumerate(REASONING_SOFT_VETOES)))
+
+
+# Literal substrings that must be present for any pattern of the
+# category to match; used as a cheap gate before the regex pass.
+# Anchors must not span whitespace - the patterns accept any \s+ run,
+# which a multi-word literal would fail to cover
+_HARD_ANCHORS = (
+    'cannot',
+    'impossible',
+    'reliable',
+    'evidence',
+    'access',
+    'information',
+    'covered',
+    'mentioned',
+    'addressed',
+    'outside',
+    'conflict',
+    'disagree',
+)
+_SOFT_ANCHORS = (
+    'uncertain',
+    'speculat',
+    'projection',
+    'may',
+    'estimat',
+    'guess',
+    'assum',
+    'infer',
+    'deduc',
+    'conjectur',
+    'certain',
+    'confident',
+    'sure',
+    'confidence',
+    'seems',
+    'probab',
+    'likely',
+)
+
+if AHOCORASICK_AVAILABLE:
+    _anchor_tags: dict[str, set] = {}
+    for _word in _HARD_ANCHORS:
+        _anchor_tags.setdefault(_word, set()).add('hard')
+    for _word in _SOFT_ANCHORS:
+        _anchor_tags.setdefault(_word, set()).add('soft')
+
+    _ANCHOR_AUTOMATON = ahocorasick.Automaton()
+    for _word, _tags in _anchor_tags.items():
+        _ANCHOR_AUTOMATON.add_word(_word, frozenset(_tags))
+    _ANCHOR_AUTOMATON.make_automaton()
+else:
+    _ANCHOR_AUTOMATON = None
+
+
+def _anchor_categories(text: str) -> set:
+    # Which veto categories have at least one literal anchor in the text
+    categories = set()
+    for _, tags in _ANCHOR_AUTOMATON.iter(text):
+        categories |= tags
+        if len(categories) == 2:
+            break
+    return categories
+
+
+def _collect_fused_matches(regex: re.Pattern, text: str, pattern_count: int) -> list[str]:
+    # First match per alternative, stopping once every pattern has
+    # fired. The scan restarts just past each match's start rather than
+    # at its end so overlapping signals all fire, as they did with one
+    # search per pattern: 'seems likely' must not consume the 'likely'
+    # that another alternative matches.
+    seen: dict[str, str] = {}
+    pos = 0
+    while len(seen) < pattern_count:
+        match = regex.search(text, pos)
+        if match is None:
+            break
+        group = match.lastgroup
+        if group not in seen:
+            seen[group] = match.group(0)
+        pos = match.start() + 1
+    return list(seen.values())
+
+# Both tone categories in one scan; the named group tells which fired
+_TONE_RE = re.compile(
+    r'(?P<conf>\b(?:clearly|definitely|certainly|without\s+doubt|proven)\b'
+    r'|\b(?:is\s+)?the\s+(?:answer|fact|case)\b)'
+    r'|(?P<unc>\b(?:might|could|may|possibly|arguably)\b'
+    r'|\b(?:seems?|appears?)\b'
+    r'|\bunsure\b)'
+)
+
+# One fused alternation: a single scan of the answer instead of one
+# search per word
+_ANSWER_CONFIDENT_RE = re.compile(r'\b(?:definitely|clearly|certainly)\b')
+
+# Constant parts of the soft-veto reason, built once
+_SOFT_REASON = 'Reasoning expresses uncertainty: %s'
+_SOFT_CONTRA_SUFFIX = ' (model contradicts itself with confident tone in answer)'
+
+
 # ============================================================
 # ANALYZER
 # ============================================================
 
 
+# Shared read-only result for the no-veto fast paths: the proxy makes
+# accidental mutation a loud error instead of cross-call state bleed,
+# so no per-call allocation is needed
+_EMPTY_ASSERTIONS = MappingProxyType(
+    {
+        'has_hard_veto': False,
+        'hard_veto_signals': (),
+        'has_soft_veto': False,
+        'soft_veto_signals': (),
+        'tone_analysis': MappingProxyType(
+            {
+                'confident_language': False,
+                'uncertain_language': False,
+                'contradictory': False,
+            }
+        ),
+    }
+)
+
+
 def extract_reasoning_assertions(reasoning: str) -> dict:
     """
     Parse reasoning to extract what model asserts about its own confidence.
 
     """
     if not reasoning:
-        return {
-            'has_hard_veto': False,
-            'hard_veto_signals': [],
-            'has_soft_veto': False,
-            'soft_veto_signals': [],
-            'tone_analysis': {
-                'confident_language': False,
-                'uncertain_language': False,
-                'contradictory': False,
-            },
-        }
+        return _EMPTY_ASSERTIONS
 
     reasoning_lower = reasoning.lower()
 
-    # Check hard vetoes
-    hard_matches = []
-    for pattern in REASONING_HARD_VETOES:
-        if re.search(pattern, reasoning_lower, re.IGNORECASE):
-            # Extract the matched phrase for clarity
-            match = re.search(pattern, reasoning_lower, re.IGNORECASE)
-            if match:
-                hard_matches.append(match.group(0))
-
-    # Check soft vetoes
-    soft_matches = []
-    for pattern in REASONING_SOFT_VETOES:
-        if re.search(pattern, reasoning_lower, re.IGNORECASE):
-            match = re.search(pattern, reasoning_lower, re.IGNORECASE)
-            if match:
-                soft_matches.append(match.group(0))
-
-    # Tone analysis
-    confident_patterns = [
-        r'\b(?:clearly|definitely|certainly|without\s+doubt|proven)\b',
-        r'\b(?:is\s+)?the\s+(?:answer|fact|case)\b',
-    ]
-    uncertain_patterns = [
-        r'\b(?:might|could|may|possibly|arguably)\b',
-        r'\b(?:seems?|appears?)\b',
-        r'\bunsure\b',
-    ]
-
-    has_confident = any(re.search(p, reasoning_lower) for p in confident_patterns)
-    has_uncertain = any(re.search(p, reasoning_lower) for p in uncertain_patterns)
+    # Anchor prefilter: most reasoning contains no veto language at all,
+    # and the automaton pass rules categories out without running regexes.
+    # Without the automaton, substring scans (C-level, far cheaper than
+    # the fused regexes) gate each category instead.
+    if _ANCHOR_AUTOMATON is not None:
+        categories = _anchor_categories(reasoning_lower)
+        hard_possible = 'hard' in categories
+        soft_possible = 'soft' in categories
+    else:
+        hard_possible = any(a in reasoning_lower for a in _HARD_ANCHORS)
+        soft_possible = any(a in reasoning_lower for a in _SOFT_ANCHORS)
+
+    # No anchor at all: skip the regex machinery entirely. Tone analysis
+    # is only consulted downstream when a soft veto fired, so it is
+    # safely skipped too.
+    if not hard_possible and not soft_possible:
+        return _EMPTY_ASSERTIONS
+
+    # Check hard and soft vetoes - one fused pass per category
+    hard_matches = (
+        _collect_fused_matches(_HARD_VETO_RE, reasoning_lower, len(REASONING_HARD_VETOES))
+        if hard_possible
+        else []
+    )
+    soft_matches = (
+        _collect_fused_matches(_SOFT_VETO_RE, reasoning_lower, len(REASONING_SOFT_VETOES))
+        if soft_possible
+        else []
+    )
+
+    # Tone analysis: single pass, stop once both tones have been seen
+    has_confident = False
+    has_uncertain = False
+    for match in _TONE_RE.finditer(reasoning_lower):
+        if match.lastgroup == 'conf':
+            has_confident = True
+        else:
+            has_uncertain = True
+        if has_confident and has_uncertain:
+            break
     is_contradictory = has_confident and has_uncertain
 
     return {
@@ -188,10 +333,7 @@ def assess_reasoning_veto(
 
         # Check if reasoning contradicts answer tone
         answer_lower = answer.lower() if answer else ''
-        answer_has_confident_tone = any(
-            re.search(pattern, answer_lower)
-            for pattern in [r'\bdefinitely\b', r'\bclearly\b', r'\bcertainly\b']
-        )
+        answer_has_confident_tone = bool(answer_lower and _ANSWER_CONFIDENT_RE.search(answer_lower))
 
         contradiction_detected = assertions['tone_analysis']['contradictory'] or (
             assertions['has_soft_veto'] and answer_has_confident_tone
@@ -200,10 +342,11 @@ def assess_reasoning_veto(
         # Cap confidence based on soft veto strength (for logging only)
         confidence_cap = 0.5 if contradiction_detected else 0.6 if len(soft_signals) >= 3 else 0.7
 
-        reason = f'Reasoning expresses uncertainty: {", ".join(soft_signals[:2])}'
+        shown = soft_signals if len(soft_signals) <= 2 else soft_signals[:2]
+        reason = _SOFT_REASON % ', '.join(shown)
 
         if contradiction_detected:
-            reason += ' (model contradicts itself with confident tone in answer)'
+            reason += _SOFT_CONTRA_SUFFIX
 
         return ReasoningVeto(
             level=VetoLevel.SOFT,
@@ -16,9 +16,24 @@ URL Extraction:
 
 """
 
+import asyncio
 import logging
 import re
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
+from urllib.parse import urlsplit
+
+from cachetools import TTLCache
+
+# Keyword routing prefilter: one automaton pass over the query instead
+# of one substring scan per keyword (optional - any() fallback)
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
 
 from app.config.settings import settings
 from app.config.web_providers.ddg import DuckDuckGoProvider
@@ -38,6 +53,18 @@ searxng = SearXNGProvider()
 ddg = DuckDuckGoProvider()
 tavily = TavilyProvider()
 
+# Rule-flag name -> provider instance; routing order is data, so the
+# branches below stay a single comprehension per tier
+PROVIDERS = {
+    'serper': serper,
+    'searxng': searxng,
+    'duckduckgo': ddg,
+    'tavily': tavily,
+}
+_ADVANCE_ORDER = ('tavily', 'serper', 'searxng', 'duckduckgo')
+_FREE_TIER = ('searxng', 'duckduckgo')
+_PAID_TIER = ('tavily', 'serper')
+
 # Centralized limit settings
 RESULTS_PER_PROVIDER = settings.WEB_SEARCH_RESULTS_PER_PROVIDER
 ADVANCE_SEARCH_TOTAL = settings.WEB_SEARCH_ADVANCE_TOTAL
@@ -46,41 +73,134 @@ ADVANCE_SEARCH_TOTAL = settings.WEB_SEARCH_ADVANCE_TOTAL
 # If query contains these words and Tavily is enabled, route to Tavily
 TAVILY_KEYWORDS = settings.WEB_TAVILY_KEYWORDS
 
-URL_PATTERN = re.compile(
-    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
-    re.IGNORECASE,
-)
+# Lowercased once at import: the query is matched lowercased, so a
+# mixed-case configured keyword would otherwise never fire
+_TAVILY_KW_LOWER = tuple(dict.fromkeys(k.lower() for k in TAVILY_KEYWORDS))
+
+if AHOCORASICK_AVAILABLE and _TAVILY_KW_LOWER:
+    _TAVILY_AC = ahocorasick.Automaton()
+    for _kw in _TAVILY_KW_LOWER:
+        _TAVILY_AC.add_word(_kw, _kw)
+    _TAVILY_AC.make_automaton()
+else:
+    _TAVILY_AC = None
+
+
+def _has_tavily_keyword(q_lower: str) -> bool:
+    # Single linear scan over the query regardless of keyword count
+    if _TAVILY_AC is not None:
+        return next(_TAVILY_AC.iter(q_lower), None) is not None
+    return any(kw in q_lower for kw in _TAVILY_KW_LOWER)
+
+# Single character class instead of a per-character alternation: one
+# bitmap test per char, no backtracking. [$-_] is the ASCII range $..._
+# (digits, letters, and the URL punctuation the old alternation listed).
+URL_PATTERN = re.compile(r'https?://[!$-_a-z]+', re.IGNORECASE | re.ASCII)
+
+# Tracking query parameters that don't change the page content
+_TRACKING_PARAM_RE = re.compile(r'^(?:utm_|mc_)|^(?:fbclid|gclid)$')
+
+
+def _canon(url: str) -> str:
+    # Dedup key for a URL: providers return the same page with differing
+    # scheme, host case, trailing slash, or tracking params tacked on.
+    # The original URL is kept in the result - this is only the set key.
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    query = '&'.join(
+        pair
+        for pair in parts.query.split('&')
+        if pair and not _TRACKING_PARAM_RE.match(pair.split('=', 1)[0])
+    )
+    path = parts.path.rstrip('/')
+    canon = f'{parts.netloc.lower()}{path}'
+    return f'{canon}?{query}' if query else canon
 
 # ============================================================
 # Rules
 # ============================================================
 
-DEFAULT_RULES = RulesConfig().model_dump()
+# Read-only view: the pure-default paths hand this out directly instead
+# of allocating a fresh copy per request, and the proxy guarantees no
+# caller can mutate the shared defaults
+DEFAULT_RULES = MappingProxyType(RulesConfig().model_dump())
+
+# Rules change rarely but are read on every search/extract; a short TTL
+# keeps the Mongo round-trips off the hot path. Keyed by session_id
+# (None = global rules); values are already merged over DEFAULT_RULES.
+_rules_cache: TTLCache = TTLCache(maxsize=2048, ttl=15)
+
+
+def invalidate_rules_cache(session_id: Optional[str] = None) -> None:
+    """
+    Drop cached rules after a rules write so the change applies immediately.
+
+    Without a session_id (a global rules update) the whole cache is
+    cleared, since every session without its own rules inherits them.
+
+    """
+    if session_id is None:
+        _rules_cache.clear()
+    else:
+        _rules_cache.pop(session_id, None)
 
 
-def get_enabled_rules(session_id: Optional[str] = None) -> dict:
+def get_enabled_rules(session_id: Optional[str] = None) -> Mapping:
     """
     Get enabled search providers and search settings for a session.
 
     """
-    try:
-        if session_id:
-            session = sessions_collection.find_one(
-                {'id': session_id},
-                {'_id': 0, 'rules': 1},
-            )
-            if session and session.get('rules'):
-                return {**DEFAULT_RULES, **session['rules']}
+    cached = _rules_cache.get(session_id)
+    if cached is not None:
+        return cached if cached is DEFAULT_RULES else cached.copy()
 
-        rules = rules_collection.find_one({}, {'_id': 0})
-        if rules:
-            return {**DEFAULT_RULES, **rules}
+    try:
+        session_rules = None
+        global_rules = None
 
-        return DEFAULT_RULES.copy()
+        if session_id:
+            # One command fetches the session rules and the global
+            # fallback together: the cold path previously paid two
+            # round-trips whenever the session had no rules of its own
+            pipeline = [
+                {'$match': {'id': session_id}},
+                {'$project': {'_id': 0, 'source': {'$literal': 'session'}, 'rules': '$rules'}},
+                {
+                    '$unionWith': {
+                        'coll': rules_collection.name,
+                        'pipeline': [
+                            {'$project': {'_id': 0}},
+                            {'$replaceRoot': {'newRoot': {'source': 'global', 'rules': '$$ROOT'}}},
+                        ],
+                    }
+                },
+            ]
+            for doc in sessions_collection.aggregate(pipeline):
+                if doc['source'] == 'session' and doc.get('rules'):
+                    session_rules = doc['rules']
+                elif doc['source'] == 'global' and global_rules is None and doc.get('rules'):
+                    global_rules = doc['rules']
+        else:
+            global_rules = rules_collection.find_one({}, {'_id': 0})
+
+        # Precedence unchanged: session rules win outright, then global,
+        # then the frozen defaults
+        if session_rules:
+            merged = {**DEFAULT_RULES, **session_rules}
+        elif global_rules:
+            merged = {**DEFAULT_RULES, **global_rules}
+        else:
+            merged = DEFAULT_RULES
+
+        _rules_cache[session_id] = merged
+        return merged if merged is DEFAULT_RULES else merged.copy()
 
     except Exception as e:
         logger.warning(f'Failed to fetch rules, using defaults: {e}')
-        return DEFAULT_RULES.copy()
+        return DEFAULT_RULES
 
 
 # ============================================================
@@ -88,6 +208,14 @@ def get_enabled_rules(session_id: Optional[str] = None) -> dict:
 # ============================================================
 
 
+# In-flight coalescing plus a short result cache: concurrent identical
+# searches share one upstream pass, and immediate repeats are served
+# from memory without burning provider quota. Keys include session_id
+# because routing depends on the session's rules.
+_inflight_searches: dict[str, asyncio.Task] = {}
+_search_result_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+
 async def maybe_web_search(
     query: str,
     limit: Optional[int] = None,
@@ -104,30 +232,47 @@ async def maybe_web_search(
     if limit is None:
         limit = RESULTS_PER_PROVIDER
 
+    query = query.strip()
+    q_lower = query.lower()
+
+    key = f'{session_id}|{q_lower}|{limit}'
+    cached = _search_result_cache.get(key)
+    if cached is not None:
+        logger.info('Web search result cache hit')
+        return list(cached)
+
+    task = _inflight_searches.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_routed_search(query, q_lower, limit, session_id))
+        _inflight_searches[key] = task
+        task.add_done_callback(lambda _t, _k=key: _inflight_searches.pop(_k, None))
+
+    # shield: one caller disconnecting must not cancel the shared search
+    results = await asyncio.shield(task)
+    if results:
+        _search_result_cache[key] = results
+    return list(results)
+
+
+async def _routed_search(
+    query: str,
+    q_lower: str,
+    limit: int,
+    session_id: Optional[str],
+) -> list[dict]:
     rules = get_enabled_rules(session_id)
     logger.info(f'Current rules: {rules}')
     logger.info(
         f'Current quotas - Serper: {remaining_serper_quota()}, Tavily: {remaining_tavily_quota()}'
     )
 
-    query = query.strip()
-    q_lower = query.lower()
-
     # ---------------------------------------------------------------
     # Advance Search
     # ---------------------------------------------------------------
     if rules['advanceSearch']:
         logger.info('Advance search mode enabled')
 
-        providers = []
-        if rules['tavily']:
-            providers.append(tavily)
-        if rules['serper']:
-            providers.append(serper)
-        if rules['searxng']:
-            providers.append(searxng)
-        if rules['duckduckgo']:
-            providers.append(ddg)
+        providers = [PROVIDERS[name] for name in _ADVANCE_ORDER if rules[name]]
 
         if not providers:
             logger.warning('Advance search: all providers disabled')
@@ -137,24 +282,39 @@ async def maybe_web_search(
         results: list[dict] = []
         seen_urls: set[str] = set()
 
-        for provider in providers:
-            try:
-                provider_results = await provider.search(query, per_provider)
-                for r in provider_results:
-                    url = r.get('link')
-                    if not url or url in seen_urls:
+        # Fan out concurrently and accumulate as providers finish; once
+        # the cap is reached, providers still in flight are cancelled
+        # instead of awaited, freeing their pooled connections early
+        tasks = {asyncio.ensure_future(p.search(query, per_provider)): p for p in providers}
+        pending = set(tasks)
+        try:
+            while pending and len(results) < ADVANCE_SEARCH_TOTAL:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        outcome = task.result()
+                    except Exception as e:
+                        logger.warning(f'{provider.name} failed in advance search: {e}')
                         continue
 
-                    results.append(r)
-                    seen_urls.add(url)
+                    for r in outcome:
+                        url = r.get('link')
+                        if not url:
+                            continue
 
-                    if len(results) >= ADVANCE_SEARCH_TOTAL:
-                        break
-            except Exception as e:
-                logger.warning(f'{provider.name} failed in advance search: {e}')
+                        key = _canon(url)
+                        if key in seen_urls:
+                            continue
+
+                        results.append(r)
+                        seen_urls.add(key)
 
-            if len(results) >= ADVANCE_SEARCH_TOTAL:
-                break
+                        if len(results) >= ADVANCE_SEARCH_TOTAL:
+                            break
+        finally:
+            for task in pending:
+                task.cancel()
 
         logger.info(f'Advance search returning {len(results)} results')
         return results[:ADVANCE_SEARCH_TOTAL]
@@ -162,7 +322,7 @@ async def maybe_web_search(
     # ---------------------------------------------------------------
     # Auto-route to Tavily (research queries)
     # ---------------------------------------------------------------
-    if rules['tavily'] and any(kw in q_lower for kw in TAVILY_KEYWORDS):
+    if rules['tavily'] and _has_tavily_keyword(q_lower):
         logger.info('Auto-routing to Tavily (research query)')
         try:
             return await tavily.search(query, limit)
@@ -174,34 +334,49 @@ async def maybe_web_search(
     # ---------------------------------------------------------------
     logger.info('Using default search routing')
 
-    if rules['searxng']:
-        try:
-            results = await searxng.search(query, limit)
+    # Free providers race each other; the paid tier only runs (and only
+    # spends quota) when neither free provider returns anything.
+    for names in (_FREE_TIER, _PAID_TIER):
+        tier = [PROVIDERS[name] for name in names if rules[name]]
+        if tier:
+            results = await _race_providers(tier, query, limit)
             if results:
                 return results
-        except Exception as e:
-            logger.warning(f'SearXNG failed: {e}')
 
-    if rules['duckduckgo']:
-        try:
-            return await ddg.search(query, limit)
-        except Exception as e:
-            logger.warning(f'DuckDuckGo failed: {e}')
+    logger.error('All search providers failed or disabled')
+    return []
 
-    if rules['tavily']:
-        try:
-            return await tavily.search(query, limit)
-        except Exception as e:
-            logger.warning(f'Tavily failed: {e}')
 
-    if rules['serper']:
-        try:
-            return await serper.search(query, limit)
-        except Exception as e:
-            logger.warning(f'Serper failed: {e}')
+async def _race_providers(providers: list, query: str, limit: int) -> list[dict]:
+    """
+    Race providers concurrently; first non-empty result wins.
 
-    logger.error('All search providers failed or disabled')
-    return []
+    The serial fallback chain paid the sum of timeouts when an early
+    provider was down (~5s each). Racing makes the worst case one
+    timeout. Ties resolve in the given priority order, and losers are
+    cancelled so no work outlives the winner.
+
+    """
+    tasks = {asyncio.ensure_future(p.search(query, limit)): p for p in providers}
+    priority = {task: i for i, task in enumerate(tasks)}
+
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=priority.__getitem__):
+                provider = tasks[task]
+                try:
+                    results = task.result()
+                except Exception as e:
+                    logger.warning(f'{provider.name} failed: {e}')
+                    continue
+                if results:
+                    return results
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 # ============================================================
@@ -210,9 +385,33 @@ async def maybe_web_search(
 
 
 def extract_url_from_text(text: str) -> Optional[str]:
-    # Extract first URL found in text
-    match = URL_PATTERN.search(text.strip())
-    return match.group(0) if match else None
+    # Every URL starts with 'http', so str.find (a C memmem loop) does
+    # the scanning and the regex only runs anchored at each candidate
+    # offset - the no-URL common case never enters the regex engine,
+    # and the engine never walks non-URL prefixes
+    i = text.find('http')
+    while i != -1:
+        match = URL_PATTERN.match(text, i)
+        if match:
+            return match.group(0)
+        i = text.find('http', i + 4)
+    return None
+
+
+# Pages change slowly; successful extractions are cached for an hour by
+# canonical URL (plus the extract-rule flags, which shape the output)
+# so repeats skip the fetch and any Tavily quota spend entirely
+_extract_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+
+def invalidate_extract(url: str) -> None:
+    """
+    Drop cached extractions for a URL (any rule combination).
+
+    """
+    canon = _canon(url)
+    for key in [k for k in _extract_cache if k[0] == canon]:
+        _extract_cache.pop(key, None)
 
 
 async def maybe_extract(
@@ -222,37 +421,60 @@ async def maybe_extract(
     if not user_text or not user_text.strip():
         return ''
 
+    # Most messages contain no URL at all; a C-level substring scan
+    # skips the regex and the rules lookup for that common case.
+    # Case-sensitive on purpose - pasted schemes are lowercase.
+    if 'http' not in user_text:
+        return ''
+
     rules = get_enabled_rules(session_id)
 
-    cleaned_text = ' '.join(user_text.strip().split())
-    url = extract_url_from_text(cleaned_text)
+    url = extract_url_from_text(user_text)
 
     if not url:
         logger.debug('No URL detected')
         return ''
 
+    cache_key = (
+        _canon(url),
+        bool(rules['advanceExtract']),
+        bool(rules['localExtract']),
+        bool(rules['tavilyExtract']),
+    )
+    cached = _extract_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f'Extract cache hit for {url}')
+        return cached
+
+    extracted = await _run_extract(url, rules)
+    if extracted:
+        _extract_cache[cache_key] = extracted
+    return extracted
+
+
+async def _run_extract(url: str, rules: Mapping) -> str:
     # ---------------------------------------------------------------
     # Advance Extract
     # ---------------------------------------------------------------
     if rules['advanceExtract']:
         logger.info(f'Advance extract for {url}')
-        results: list[str] = []
 
+        # Both extractors run concurrently; awaiting in order keeps the
+        # [Local] then [Tavily] output layout deterministic
+        tasks: list[tuple[str, asyncio.Task]] = []
         if rules['localExtract']:
-            try:
-                content = await extract_url_local(url)
-                if content:
-                    results.append(f'[Local]\n{content}')
-            except Exception as e:
-                logger.warning(f'Local extract failed: {e}')
-
+            tasks.append(('Local', asyncio.ensure_future(extract_url_local(url))))
         if rules['tavilyExtract']:
+            tasks.append(('Tavily', asyncio.ensure_future(extract_url(url))))
+
+        results: list[str] = []
+        for label, task in tasks:
             try:
-                content = await extract_url(url)
+                content = await task
                 if content:
-                    results.append(f'[Tavily]\n{content}')
+                    results.append(f'[{label}]\n{content}')
             except Exception as e:
-                logger.warning(f'Tavily extract failed: {e}')
+                logger.warning(f'{label} extract failed: {e}')
 
         return '\n---\n'.join(results) if results else ''
 
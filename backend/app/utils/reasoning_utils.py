@@ -5,12 +5,16 @@ Captures how the model arrived at each answer for future improvement
 """
 
 import uuid
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+# These are internal log structures built once per reasoning hop;
+# plain slotted dataclasses skip Pydantic's per-instance validation and
+# __dict__, which is pure overhead for data we construct ourselves
 
 
-class ReasoningStep(BaseModel):
+@dataclass(slots=True)
+class ReasoningStep:
     """
     Individual reasoning step in the chain
 
@@ -20,48 +24,61 @@ class ReasoningStep(BaseModel):
     thought: str  # What the model thought
     action: str  # What action was taken (search, retrieve, synthesize, etc.)
     source: str  # Which source was consulted (memory, web, history, etc.)
-    information_gathered: str | None = None  # What was found
     confidence: float  # 0-1 confidence in this step
-    alternatives_considered: list[str] = Field(
+    information_gathered: str | None = None  # What was found
+    alternatives_considered: list[str] = field(
         default_factory=list
     )  # Other options that were rejected
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
-class ReasoningChain(BaseModel):
+@dataclass(slots=True)
+class ReasoningChain:
     """
     Complete reasoning chain for one message response
 
     """
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     session_id: str
     message_id: str  # Reference to the user's message
-    reasoning_steps: list[ReasoningStep] = Field(default_factory=list)
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    reasoning_steps: list[ReasoningStep] = field(default_factory=list)
 
     # Final outcome
     final_answer: str | None = None
     final_confidence: float | None = None  # 0-1 overall confidence
-    sources_used: list[str] = Field(default_factory=list)  # Which sources contributed
-    sources_considered: dict[str, float] = Field(
+    sources_used: list[str] = field(default_factory=list)  # Which sources contributed
+    sources_considered: dict[str, float] = field(
         default_factory=dict
     )  # All sources evaluated: {source: confidence}
-    uncertainty_flags: list[str] = Field(default_factory=list)  # Aspects the model was unsure about
+    uncertainty_flags: list[str] = field(default_factory=list)  # Aspects the model was unsure about
 
     # Metadata
     model_used: str | None = None  # Which LLM model
     total_duration_ms: float | None = None  # How long reasoning took
     tokens_used: int = 0
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=datetime.utcnow)
 
     # User feedback (if provided later)
     user_rating: int | None = None  # 1-5 star rating
     user_feedback: str | None = None  # User's comment
     was_helpful: bool | None = None  # True/False feedback
-    corrections: list[dict] = Field(
+    corrections: list[dict] = field(
         default_factory=list
     )  # [{step: 3, issue: "...", correction: "..."}]
 
+    # Distinct step sources in first-seen order, maintained as steps are
+    # added so complete() doesn't rescan the whole chain (dict as an
+    # ordered set)
+    _sources_seen: dict = field(default_factory=dict, repr=False)
+
+    def dict(self) -> dict:
+        # Same name as the Pydantic serializer so Mongo writes in
+        # chat_service keep working unchanged
+        d = asdict(self)
+        d.pop('_sources_seen', None)
+        return d
+
     def add_step(
         self,
         thought: str,
@@ -84,6 +101,7 @@ class ReasoningChain(BaseModel):
             alternatives_considered=alternatives or [],
         )
         self.reasoning_steps.append(step)
+        self._sources_seen[source] = None
         return step
 
     def complete(
@@ -98,7 +116,7 @@ class ReasoningChain(BaseModel):
         self.final_confidence = final_confidence
         self.model_used = model_used
         self.total_duration_ms = duration_ms
-        self.sources_used = list(set(s.source for s in self.reasoning_steps))
+        self.sources_used = list(self._sources_seen)
 
 
 class ReasoningTracker:
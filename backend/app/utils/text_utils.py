@@ -9,8 +9,15 @@ Reusable text manipulation functions for:
 
 import re
 
+import numpy as np
+
 from app.config.settings import settings
 
+# Compiled once at import: these run per document in summarization
+# paths, and the re-module cache lookup per call adds up
+_CAP_PHRASE_RE = re.compile(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+
 
 def truncate_text(text: str, max_chars: int, add_ellipsis: bool = True) -> str:
     """
@@ -45,6 +52,26 @@ def calculate_sentence_score(position: int, length: int, total_sentences: int) -
     return score
 
 
+def calculate_sentence_scores(lengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_sentence_score for a whole document.
+
+    Positions are implicit: index i in the lengths array is sentence i.
+    One NumPy pass replaces a Python-level call per sentence, which
+    dominates when scoring hundreds of sentences at once.
+
+    """
+    positions = np.arange(1, lengths.shape[0] + 1, dtype=np.float32)
+    position_weights = 1.0 / positions
+    length_weights = np.minimum(
+        lengths.astype(np.float32) / settings.TEXT_SENTENCE_WEIGHT_DENOMINATOR, 1.0
+    )
+    return (
+        position_weights * settings.SENTENCE_SCORE_POSITION_WEIGHT
+        + length_weights * settings.SENTENCE_SCORE_LENGTH_WEIGHT
+    )
+
+
 def extract_key_phrases(text: str, max_phrases: int = 5) -> list[str]:
     """
     Extract key phrases from text using pattern matching.
@@ -54,18 +81,14 @@ def extract_key_phrases(text: str, max_phrases: int = 5) -> list[str]:
         return []
 
     # Extract capitalized phrases (likely important terms/names)
-    phrases = re.findall(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b', text)
+    phrases = _CAP_PHRASE_RE.findall(text)
 
-    # Deduplicate while preserving order
-    seen = set()
-    unique_phrases = []
+    # Deduplicate case-insensitively, keeping the first-seen casing
+    unique_phrases: dict[str, str] = {}
     for phrase in phrases:
-        phrase_lower = phrase.lower()
-        if phrase_lower not in seen:
-            seen.add(phrase_lower)
-            unique_phrases.append(phrase)
+        unique_phrases.setdefault(phrase.lower(), phrase)
 
-    return unique_phrases[:max_phrases]
+    return list(unique_phrases.values())[:max_phrases]
 
 
 def split_into_sentences(text: str, min_length: int = None) -> list[str]:
@@ -79,33 +102,42 @@ def split_into_sentences(text: str, min_length: int = None) -> list[str]:
     if not text:
         return []
 
-    # Split by sentence-ending punctuation
-    sentences = re.split(r'[.!?]+', text)
-
-    # Filter and clean
-    sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) >= min_length]
+    # Split by sentence-ending punctuation, stripping each fragment once
+    sentences = []
+    for fragment in _SENT_SPLIT_RE.split(text):
+        fragment = fragment.strip()
+        if fragment and len(fragment) >= min_length:
+            sentences.append(fragment)
 
     return sentences
 
 
+
+# Every whitespace run is rewritten in a single traversal; the three
+# sub/split/join passes each copied the whole string
+_WS_RUN_RE = re.compile(r'\s+')
+
+
+def _collapse_ws_run(match: re.Match) -> str:
+    run = match.group()
+    newlines = run.count('\n')
+    if newlines == 0:
+        return ' '
+    return '\n\n' if newlines >= 2 else '\n'
+
+
 def normalize_whitespace(text: str) -> str:
     """
     Normalize whitespace in text (collapse multiple spaces, normalize newlines).
 
+    Horizontal runs collapse to one space, runs containing a newline to
+    one newline (two for paragraph breaks), and the ends are stripped.
+
     """
     if not text:
         return text
 
-    # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
-
-    # Replace multiple newlines with double newline
-    text = re.sub(r'\n\n+', '\n\n', text)
-
-    # Remove leading/trailing whitespace per line
-    lines = [line.strip() for line in text.split('\n')]
-
-    return '\n'.join(lines)
+    return _WS_RUN_RE.sub(_collapse_ws_run, text).strip()
 
 
 def create_preview(text: str, max_chars: int, context: str = '') -> str:
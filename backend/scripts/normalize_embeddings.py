@@ -0,0 +1,45 @@
+"""
+One-shot migration: normalize stored memory embeddings to unit length.
+
+Memory search scores with a bare dot product and relies on stored
+embeddings being unit-length (embed() has always normalized, so this is
+a safety net for documents written by older builds or imported data).
+Run once from backend/:
+
+    python -m scripts.normalize_embeddings
+
+"""
+
+import logging
+
+import numpy as np
+
+from app.core.db import synthesized_memory_collection
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    scanned = 0
+    updated = 0
+    cursor = synthesized_memory_collection.find(
+        {'embedding': {'$exists': True}}, {'embedding': 1}
+    )
+    for doc in cursor:
+        scanned += 1
+        arr = np.asarray(doc['embedding'], dtype=np.float32)
+        norm = float(np.sqrt(np.vdot(arr, arr)))
+        if norm == 0 or abs(norm - 1.0) < 1e-4:
+            continue
+        arr /= norm
+        synthesized_memory_collection.update_one(
+            {'_id': doc['_id']}, {'$set': {'embedding': arr.tolist()}}
+        )
+        updated += 1
+
+    logger.info(f'Scanned {scanned} embeddings, normalized {updated}')
+
+
+if __name__ == '__main__':
+    main()